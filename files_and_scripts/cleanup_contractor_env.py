@@ -36,6 +36,10 @@ except ImportError:
         logger.warning("Manifest system not available, using fallback discovery")
         MANIFEST_AVAILABLE = False
 
+# Compiled once for the naming helpers; kebab and snake case share a pattern
+_UNSAFE_CHAR_RE = re.compile(r'[^a-zA-Z0-9-]')
+_NON_ALNUM_RUN_RE = re.compile(r'[^a-zA-Z0-9]+')
+
 # SHARED NAMING SYSTEM (same as setup script)
 class ResourceNaming:
     """Centralized naming system for all GCP resources"""
@@ -52,15 +56,15 @@ class ResourceNaming:
     
     def _make_safe_name(self, name: str) -> str:
         """Make a name safe for GCP resources (alphanumeric + hyphens)"""
-        return re.sub(r'[^a-zA-Z0-9-]', '-', name.lower()).strip('-')
+        return _UNSAFE_CHAR_RE.sub('-', name.lower()).strip('-')
     
     def _make_kebab_case(self, name: str) -> str:
         """Convert to kebab-case (lowercase with hyphens)"""
-        return re.sub(r'[^a-zA-Z0-9]+', '-', name.lower()).strip('-')
+        return _NON_ALNUM_RUN_RE.sub('-', name.lower()).strip('-')
     
     def _make_snake_case(self, name: str) -> str:
         """Convert to snake_case (lowercase with underscores)"""
-        return re.sub(r'[^a-zA-Z0-9]+', '_', name.lower()).strip('_')
+        return _NON_ALNUM_RUN_RE.sub('_', name.lower()).strip('_')
     
     @property
     def github_repo_name(self) -> str:
@@ -84,7 +88,7 @@ class ProjectDiscovery:
         """Load master configuration"""
         try:
             with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
         except FileNotFoundError:
             logger.warning(f"Master config not found at {config_path}, using defaults")
             return {}
@@ -150,7 +154,7 @@ class ProjectDiscovery:
     
     def generate_project_id(self, contractor_name: str) -> str:
         """Generate project ID for a contractor name using current patterns"""
-        safe_name = re.sub(r'[^a-zA-Z0-9]+', '-', contractor_name.lower()).strip('-')
+        safe_name = _NON_ALNUM_RUN_RE.sub('-', contractor_name.lower()).strip('-')
         return f"{self.project_prefix}-{safe_name}-{self.project_suffix}"
 
 class ContractorEnvironmentCleanup:
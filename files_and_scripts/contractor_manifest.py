@@ -50,7 +50,7 @@ class ContractorManifest:
         
         try:
             with open(self.manifest_path, 'r') as f:
-                data = yaml.safe_load(f) or {}
+                data = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader)) or {}
             
             environments = {}
             for project_id, env_data in data.items():
@@ -25,7 +25,7 @@ class NotificationManager:
         """Load configuration from YAML file"""
         try:
             with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
         except Exception as e:
             logger.error(f"Failed to load config from {config_path}: {e}")
             return {}
@@ -9,28 +9,201 @@ and GitHub repository creation.
 
 import os
 import json
+import atexit
+import contextlib
+import functools
 import logging
+import queue
+import random
 import subprocess
 import tempfile
+import threading
+import time
 import shutil
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 from pathlib import Path
-from typing import Dict, List, Optional
-import yaml
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, fields
 from datetime import datetime
 import re
 
 # Configure logging
+# Loggers only enqueue records; a single listener thread writes them to the console and log file,
+# so concurrent contractor setups never contend on the handler locks
+_log_queue = queue.Queue(-1)
+# The log file is opened on first write and records are batched, flushing early only on errors
+_log_file_buffer = MemoryHandler(
+    1024,
+    flushLevel=logging.ERROR,
+    target=logging.FileHandler(f'contractor_setup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log', delay=True)
+)
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(), _log_file_buffer)
+# When several contractors are set up at once, each thread records whose setup it is working on: setup_all sets it
+# on each contractor's thread, and _in_log_context carries it into the pool and output-reader threads that spawns
+_log_context = threading.local()
+
+
+class _ContractorLogFilter(logging.Filter):
+    """Prefix records with the contractor being set up on the current thread, if any"""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        contractor = getattr(_log_context, 'contractor', None)
+        record.contractor = f"[{contractor}] " if contractor else ""
+        return True
+
+
+def _in_log_context(func):
+    """Wrap func so that, wherever it runs, it logs under the contractor tag of the thread that wrapped it
+    
+    The tag is captured here, when the setup thread hands work to a pool (the setup chains, table copies)
+    or starts a thread to stream a command's output, and is set on the worker thread each time func runs,
+    so pooled threads reused for another contractor pick up the right tag.
+    """
+    contractor = getattr(_log_context, 'contractor', None)
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _log_context.contractor = contractor
+        return func(*args, **kwargs)
+    return wrapper
+
+
+_log_queue_handler = QueueHandler(_log_queue)
+_log_queue_handler.addFilter(_ContractorLogFilter())
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(f'contractor_setup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
-    ]
+    format='%(asctime)s - %(levelname)s - %(contractor)s%(message)s',
+    handlers=[_log_queue_handler]
 )
+_log_listener.start()
+
+
+def _stop_logging():
+    """Drain queued records, then write out whatever is still buffered for the log file"""
+    _log_listener.stop()
+    _log_file_buffer.flush()
+
+
+atexit.register(_stop_logging)
 logger = logging.getLogger(__name__)
 
+def _load_yaml(path: str) -> dict:
+    """Parse a YAML file with the fastest available safe loader"""
+    # Imported on first use so --help doesn't pay for it
+    import yaml
+    
+    # Prefer the libyaml-backed loader; fall back to the pure-Python one if PyYAML was built without it
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=loader)
+
+
+def _strip_generated_on(text: str) -> str:
+    """Drop the trailing "Generated on:" footer so regenerated files can be compared"""
+    return text.rsplit("Generated on:", 1)[0]
+
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    """Write a generated file unless the existing one only differs in its "Generated on:" footer
+    
+    Returns:
+        True if the file was written
+    """
+    # Always UTF-8 with "\n" line endings, whatever the platform defaults (the templates contain emoji)
+    try:
+        if _strip_generated_on(path.read_bytes().decode('utf-8', errors='replace')) == _strip_generated_on(content):
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(content.encode('utf-8'))
+    return True
+
+
+@functools.lru_cache(maxsize=4)
+def _load_master_config_at(path: str, mtime_ns: int) -> dict:
+    """Parse one version of the master config; the mtime in the key means edits are picked up"""
+    return _load_yaml(path)
+
+
+def _load_master_config_cached(path: str) -> dict:
+    """Parse the master config once per process (and again only if the file changes)"""
+    return _load_master_config_at(path, os.stat(path).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=1)
+def _default_credentials():
+    """Application default credentials, loaded once and shared by every client and contractor setup"""
+    # google-auth refreshes the token itself shortly before it expires
+    import google.auth
+    
+    credentials, _ = google.auth.default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
+    return credentials
+
+
+@functools.lru_cache(maxsize=1)
+def _api_retry():
+    """Exponential backoff on transient Google API errors (503s, 429s, dropped connections)"""
+    from google.api_core import retry
+    
+    return retry.Retry(predicate=retry.if_transient_error, initial=1.0, maximum=60.0, multiplier=2.0, timeout=600)
+
+
+# gcloud/gh/git failures worth retrying: rate limiting and server or network hiccups, not bad requests.
+# Status codes only count next to an HTTP/code/status label, so "quota of 500 projects" isn't mistaken for a 500
+_TRANSIENT_COMMAND_ERROR_RE = re.compile(
+    r'\b(?:HTTP(?:/[\d.]+)?|HttpError|code|status(?:_code)?)[\'"]?\s*[:=]?\s*[\'"]?(?:429|500|502|503|504)\b'
+    r'|rate.?limit|too many requests|internal error|backend ?error'
+    r'|service unavailable|temporarily unavailable|connection reset|try again',
+    re.IGNORECASE
+)
+COMMAND_ATTEMPTS = 3
+
+
+# SQL templates referenced by table_copy_configs, relative to where the script is run
+QUERIES_DIR = Path('queries')
+# A template that is just CREATE OR REPLACE ... AS SELECT * (comments aside) is run as a copy job instead
+_SQL_COMMENT_RE = re.compile(r'--[^\n]*')
+_PLAIN_COPY_SQL_RE = re.compile(
+    r'\s*CREATE\s+OR\s+REPLACE\s+TABLE\s+`\{target_table\}`\s+AS\s+SELECT\s+\*\s+FROM\s+`\{source_table\}`\s*;?\s*',
+    re.IGNORECASE
+)
+# Upper bound on BigQuery copy jobs running at once for one contractor, well under per-project job quotas
+MAX_CONCURRENT_TABLE_COPIES = 16
+# Lookup tables that anonymization templates join against in the target dataset, so they are copied before
+# the rest (a table_copy_configs entry with copy_first: true is treated the same way)
+LOOKUP_TABLES = ('canonical_company_names_sa',)
+# How often a wait on a BigQuery job checks whether the setup has been aborted
+JOB_POLL_SECONDS = 5
+# Outbound calls (gcloud/gh/git push commands, BigQuery and Secret Manager client calls) in flight at once
+# across all contractors, so setting several up in parallel doesn't burst past per-minute API quotas
+MAX_CONCURRENT_API_CALLS = 10
+_api_call_slots = threading.BoundedSemaphore(MAX_CONCURRENT_API_CALLS)
+# git subcommands that never leave the machine, so they don't take an API call slot
+_LOCAL_GIT_SUBCOMMANDS = frozenset({'init', 'add', 'commit', 'remote'})
+
+
+@functools.lru_cache(maxsize=64)
+def _read_query_template(path: Path) -> Optional[str]:
+    """Read a SQL template once, however many tables or contractors use it (None if it doesn't exist)"""
+    try:
+        return path.read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return None
+
+# Compiled once for the naming helpers; kebab and snake case share a pattern
+_UNSAFE_CHAR_RE = re.compile(r'[^a-zA-Z0-9-]')
+_NON_ALNUM_RUN_RE = re.compile(r'[^a-zA-Z0-9]+')
+# GCP service account IDs: 6-30 characters, lowercase letters, digits and hyphens, starting with a letter
+_SERVICE_ACCOUNT_ID_RE = re.compile(r'[a-z][-a-z0-9]{4,28}[a-z0-9]')
+
+# Repository URL printed by `gh repo create`
+_GITHUB_REPO_URL_RE = re.compile(r'https://github\.com/[\w.-]+/[\w.-]+')
+
+# Production project references in the example script, swapped for the contractor's project in one pass
+_EXAMPLE_PROJECT_REF_RE = re.compile(r'"assembled-wh"|CLOUD_RUN_PROJECT = "915401990209"')
+
 # NAMING SYSTEM CLASS
 class ResourceNaming:
     """Centralized naming system for all GCP resources"""
@@ -47,28 +220,30 @@ class ResourceNaming:
     
     def _make_safe_name(self, name: str) -> str:
         """Make a name safe for GCP resources (alphanumeric + hyphens)"""
-        return re.sub(r'[^a-zA-Z0-9-]', '-', name.lower()).strip('-')
+        return _UNSAFE_CHAR_RE.sub('-', name.lower()).strip('-')
     
     def _make_kebab_case(self, name: str) -> str:
         """Convert to kebab-case (lowercase with hyphens)"""
-        return re.sub(r'[^a-zA-Z0-9]+', '-', name.lower()).strip('-')
+        return _NON_ALNUM_RUN_RE.sub('-', name.lower()).strip('-')
     
     def _make_snake_case(self, name: str) -> str:
         """Convert to snake_case (lowercase with underscores)"""
-        return re.sub(r'[^a-zA-Z0-9]+', '_', name.lower()).strip('_')
+        return _NON_ALNUM_RUN_RE.sub('_', name.lower()).strip('_')
+    
+    # Derived names only depend on the fixed inputs above, so each is built once on first access
     
     # Service Account Names (HARDCODED to match existing client environments)
-    @property
+    @functools.cached_property
     def service_account_name(self) -> str:
         """Service account name (hardcoded for consistency with existing environments)"""
         return f"contractor-{self.contractor_name_kebab}"
     
-    @property
+    @functools.cached_property
     def service_account_email(self) -> str:
         """Full service account email (hardcoded pattern for consistency)"""
         return f"{self.service_account_name}@{self.project_id}.iam.gserviceaccount.com"
     
-    @property
+    @functools.cached_property
     def service_account_display_name(self) -> str:
         """Human-readable service account display name"""
         return f"Service Account for {self.contractor_name}"
@@ -79,18 +254,18 @@ class ResourceNaming:
         """Secret Manager secret name (hardcoded for client environment compatibility)"""
         return "bellaventure_service_account_json"
     
-    @property
+    @functools.cached_property
     def secret_name_contractor_specific(self) -> str:
         """Contractor-specific secret name (if needed for dev environments)"""
         return f"bellaventure_{self.contractor_name_snake}_service_account_json"
     
     # Cloud Run Names
-    @property
+    @functools.cached_property
     def cloud_run_service_name(self) -> str:
         """Cloud Run service name"""
         return f"{self.organization_prefix}-risk-calculator"
     
-    @property
+    @functools.cached_property
     def cloud_run_service_name_contractor_specific(self) -> str:
         """Contractor-specific Cloud Run service name"""
         return f"{self.organization_prefix}-risk-calculator-{self.contractor_name_kebab}"
@@ -101,24 +276,24 @@ class ResourceNaming:
         """BigQuery dataset name"""
         return "warehouse"
     
-    @property
+    @functools.cached_property
     def bigquery_dataset_contractor_specific(self) -> str:
         """Contractor-specific BigQuery dataset name"""
         return f"warehouse_{self.contractor_name_snake}"
     
     # GitHub Repository Names
-    @property
+    @functools.cached_property
     def github_repo_name(self) -> str:
         """GitHub repository name"""
         return f"contractor-{self.contractor_name_kebab}-dev"
     
     # File and Directory Names
-    @property
+    @functools.cached_property
     def temp_dir_prefix(self) -> str:
         """Temporary directory prefix"""
         return f"contractor_setup_{self.contractor_name_snake}_"
     
-    @property
+    @functools.cached_property
     def instructions_filename(self) -> str:
         """Contractor instructions filename"""
         return f"contractor_instructions_{self.contractor_name_snake}.md"
@@ -135,12 +310,12 @@ class ResourceNaming:
         return "risk_rating_calculator"
     
     # Log and Monitoring Names
-    @property
+    @functools.cached_property
     def log_sink_name(self) -> str:
         """Cloud Logging sink name"""
         return f"{self.organization_prefix}-risk-calculator-errors"
     
-    @property
+    @functools.cached_property
     def monitoring_uptime_check_name(self) -> str:
         """Cloud Monitoring uptime check name"""
         return f"{self.organization_prefix} Risk Calculator Health Check"
@@ -188,11 +363,26 @@ class ContractorConfig:
     target_dataset: str
     tables_to_copy: List[str]
 
+# Every ContractorConfig field must be present after merging configs
+REQUIRED_CONFIG_FIELDS = frozenset(field.name for field in fields(ContractorConfig))
+
+# GENERATED REPO FILE TEMPLATES
+# Templates live in files next to this script and are read only when needed
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+
+@functools.lru_cache(maxsize=None)
+def _read_template(name: str) -> str:
+    """Read a generated-file template once per process; str.format placeholders are filled per contractor"""
+    return (TEMPLATES_DIR / name).read_text(encoding='utf-8')
+
+
 class ContractorEnvironmentSetup:
     """Main class for setting up contractor development environments"""
     
-    def __init__(self, config: ContractorConfig):
+    def __init__(self, config: ContractorConfig, master_config_path: str = "config/master_config.yaml"):
         self.config = config
+        self.master_config_path = master_config_path
         
         # Initialize the naming system
         self.naming = ResourceNaming(
@@ -201,6 +391,14 @@ class ContractorEnvironmentSetup:
             organization_prefix="bellaventure"  # Could be made configurable
         )
         
+        # Reject names GCP would refuse now, rather than minutes in when the service account is created
+        if not _SERVICE_ACCOUNT_ID_RE.fullmatch(self.naming.service_account_name):
+            raise ValueError(
+                f"Contractor name '{config.contractor_name}' gives service account ID "
+                f"'{self.naming.service_account_name}', which GCP rejects (6-30 lowercase letters, "
+                f"digits or hyphens); use a shorter contractor_name"
+            )
+        
         # Use naming system for all resource names
         self.service_account_email = self.naming.service_account_email
         
@@ -208,9 +406,14 @@ class ContractorEnvironmentSetup:
         self.temp_dir = tempfile.mkdtemp(prefix=self.naming.temp_dir_prefix)
         self.service_account_key_path = os.path.join(self.temp_dir, self.naming.service_account_key_filename)
         
+        # Set when one branch of the setup fails, so the other stops starting new work
+        self._aborted = threading.Event()
+        
         logger.info(f"Created temporary directory: {self.temp_dir}")
         logger.info(f"Using naming system - Service Account: {self.service_account_email}")
-        logger.info(f"Resource names: {self.naming.get_all_names()}")
+        # Only build the full name dict when it will actually be logged
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Resource names: {self.naming.get_all_names()}")
         
     def setup_environment(self) -> Dict[str, str]:
         """
@@ -230,21 +433,23 @@ class ContractorEnvironmentSetup:
             logger.info("Step 2: Enabling required APIs")
             self._enable_apis()
             
-            # Step 3: Create service account
-            logger.info("Step 3: Creating service account")
-            self._create_service_account()
-            
-            # Step 4: Create BigQuery dataset
-            logger.info("Step 4: Creating BigQuery dataset")
-            self._create_bigquery_dataset()
-            
-            # Step 5: Copy and anonymize data
-            logger.info("Step 5: Copying and anonymizing data")
-            self._copy_and_anonymize_data()
-            
-            # Step 6: Create GitHub repository
-            logger.info("Step 6: Creating GitHub repository")
-            repo_url = self._create_github_repo()
+            # Steps 3-6 form two chains once the APIs are on: the BigQuery data (steps 4-5) and the service
+            # account plus the repo that ships its key (steps 3, 6). The service account is set up while the
+            # data copies, but the repo is only created once the data is in place. The first failure aborts
+            # the other chain (pending steps are skipped, running BigQuery jobs cancelled), and the pool is
+            # joined so cleanup never races a chain that is still running
+            executor = ThreadPoolExecutor(max_workers=2)
+            try:
+                data_ready = executor.submit(_in_log_context(self._set_up_data))
+                repo_ready = executor.submit(_in_log_context(self._set_up_access_and_repo), data_ready)
+                done, _ = wait([data_ready, repo_ready], return_when=FIRST_EXCEPTION)
+                failed = next((future for future in done if future.exception()), None)
+                if failed:
+                    self._aborted.set()
+                    failed.result()
+                repo_url = repo_ready.result()
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
             
             # Step 7: Generate instructions
             logger.info("Step 7: Generating contractor instructions")
@@ -269,43 +474,104 @@ class ContractorEnvironmentSetup:
             if 'results' in locals():
                 self.cleanup()
     
+    def _set_up_data(self):
+        """Create the BigQuery dataset and fill it with the contractor's tables"""
+        try:
+            # Step 4: Create BigQuery dataset
+            logger.info("Step 4: Creating BigQuery dataset")
+            self._create_bigquery_dataset()
+            
+            # Step 5: Copy and anonymize data
+            logger.info("Step 5: Copying and anonymizing data")
+            self._copy_and_anonymize_data()
+        except Exception:
+            # Tell the other chain straight away rather than when setup_environment notices
+            self._aborted.set()
+            raise
+    
+    def _set_up_access_and_repo(self, data_ready: Future) -> str:
+        """Create the service account and key, then (once the data is in place) the repository that ships the key"""
+        try:
+            # Step 3: Create service account
+            logger.info("Step 3: Creating service account")
+            self._create_service_account()
+            
+            # Only create and push the repo once the data copy has succeeded; re-raises its error otherwise
+            data_ready.result()
+            
+            # Step 6: Create GitHub repository
+            logger.info("Step 6: Creating GitHub repository")
+            self._raise_if_aborted("creating the GitHub repository")
+            return self._create_github_repo()
+        except Exception:
+            self._aborted.set()
+            raise
+    
+    def _raise_if_aborted(self, step: str):
+        """Stop before a step that creates something outside this machine if the other chain has failed"""
+        if self._aborted.is_set():
+            raise RuntimeError(f"Setup aborted, not {step}")
+    
     def _create_gcp_project(self):
         """Create a new GCP project or use existing one"""
         logger.info(f"Setting up GCP project: {self.config.project_id}")
         
-        # Check if project already exists
+        # Try to create the project; an existing one is reported as a conflict, saving a separate describe call
+        created = True
         try:
-            cmd = ["gcloud", "projects", "describe", self.config.project_id]
-            result = self._run_command(cmd, "Failed to check project existence")
-            logger.info(f"Project {self.config.project_id} already exists, skipping creation")
-        except subprocess.CalledProcessError:
-            # Project doesn't exist, create it
-            logger.info(f"Creating new GCP project: {self.config.project_id}")
             cmd = [
                 "gcloud", "projects", "create", self.config.project_id,
                 "--name", self.config.project_name
             ]
-            self._run_command(cmd, "Failed to create GCP project")
+            self._run_command(cmd, "Failed to create GCP project", log_failure=False)
             logger.info(f"GCP project {self.config.project_id} created successfully")
+        except subprocess.CalledProcessError as e:
+            if not self._already_exists(e):
+                self._log_command_failure("Failed to create GCP project", e)
+                raise
+            # Project IDs are global, so the conflict may be someone else's project; only reuse one we can see
+            cmd = ["gcloud", "projects", "describe", self.config.project_id, "--format=value(projectId)"]
+            try:
+                self._run_command(cmd, "Failed to describe existing GCP project", capture=True, log_failure=False)
+            except subprocess.CalledProcessError:
+                raise RuntimeError(
+                    f"Project ID {self.config.project_id} is already taken by a project you can't access; "
+                    f"choose a different project_id"
+                ) from e
+            created = False
+            logger.info(f"Project {self.config.project_id} already exists, skipping creation")
         
-        # Set as default project
-        cmd = ["gcloud", "config", "set", "project", self.config.project_id]
-        self._run_command(cmd, "Failed to set default project")
+        # The user's default gcloud project is left alone: every command passes the project explicitly,
+        # and contractors set up in parallel would otherwise race on the shared gcloud config
         
-        # Link billing account (always try this in case it wasn't linked before)
+        # Link billing account; a new project never has one, an existing one may be linked from an earlier run
         if self.config.billing_account_id:
-            try:
-                cmd = [
-                    "gcloud", "billing", "projects", "link", self.config.project_id,
-                    "--billing-account", self.config.billing_account_id
-                ]
-                self._run_command(cmd, "Failed to link billing account")
-                logger.info("Billing account linked successfully")
-            except subprocess.CalledProcessError:
-                logger.warning("Billing account may already be linked or you may not have permissions")
+            if not created and not self._billing_account_unlinked():
+                logger.info("Billing account already linked, skipping")
+            else:
+                try:
+                    cmd = [
+                        "gcloud", "billing", "projects", "link", self.config.project_id,
+                        "--billing-account", self.config.billing_account_id
+                    ]
+                    self._run_command(cmd, "Failed to link billing account")
+                    logger.info("Billing account linked successfully")
+                except subprocess.CalledProcessError:
+                    logger.warning("Billing account may already be linked or you may not have permissions")
         
         logger.info(f"GCP project {self.config.project_id} is ready")
     
+    def _billing_account_unlinked(self) -> bool:
+        """Whether the project is not yet linked to the configured billing account"""
+        cmd = ["gcloud", "billing", "projects", "describe", self.config.project_id, "--format=value(billingAccountName)"]
+        try:
+            linked = self._run_command(cmd, "Failed to read project billing info", capture=True,
+                                       log_failure=False).strip()
+        except subprocess.CalledProcessError:
+            # Can't tell (e.g. no billing viewer permission), so let the link attempt decide
+            return True
+        return linked != f"billingAccounts/{self.config.billing_account_id.rsplit('/', 1)[-1]}"
+    
     def _enable_apis(self):
         """Enable required GCP APIs"""
         apis = [
@@ -316,38 +582,33 @@ class ContractorEnvironmentSetup:
             "iam.googleapis.com"
         ]
         
-        for api in apis:
-            logger.info(f"Enabling API: {api}")
-            cmd = [
-                "gcloud", "services", "enable", api,
-                "--project", self.config.project_id
-            ]
-            self._run_command(cmd, f"Failed to enable API: {api}")
+        # One call enables them all; the service turns them on concurrently
+        logger.info(f"Enabling APIs: {', '.join(apis)}")
+        cmd = [
+            "gcloud", "services", "enable", *apis,
+            "--project", self.config.project_id
+        ]
+        self._run_command(cmd, f"Failed to enable APIs: {', '.join(apis)}")
     
     def _create_service_account(self):
         """Create service account with necessary permissions"""
         sa_name = self.naming.service_account_name
         sa_display_name = self.naming.service_account_display_name
-        self.service_account_email = self.naming.service_account_email
         
-        # Check if service account already exists
+        # Try to create the service account; an existing one is reported as a conflict
         try:
-            cmd = [
-                "gcloud", "iam", "service-accounts", "describe", self.service_account_email,
-                "--project", self.config.project_id
-            ]
-            self._run_command(cmd, "Failed to check service account existence")
-            logger.info(f"Service account {self.service_account_email} already exists, skipping creation")
-        except subprocess.CalledProcessError:
-            # Service account doesn't exist, create it
-            logger.info(f"Creating service account: {self.service_account_email}")
             cmd = [
                 "gcloud", "iam", "service-accounts", "create", sa_name,
                 "--display-name", sa_display_name,
                 "--project", self.config.project_id
             ]
-            self._run_command(cmd, "Failed to create service account")
+            self._run_command(cmd, "Failed to create service account", log_failure=False)
             logger.info(f"Service account {self.service_account_email} created successfully")
+        except subprocess.CalledProcessError as e:
+            if not self._already_exists(e):
+                self._log_command_failure("Failed to create service account", e)
+                raise
+            logger.info(f"Service account {self.service_account_email} already exists, skipping creation")
         
         # Grant necessary roles (always do this to ensure permissions are current)
         roles = [
@@ -358,86 +619,116 @@ class ContractorEnvironmentSetup:
             "roles/cloudbuild.builds.editor"
         ]
         
-        for role in roles:
-            try:
-                cmd = [
-                    "gcloud", "projects", "add-iam-policy-binding", self.config.project_id,
-                    "--member", f"serviceAccount:{self.service_account_email}",
-                    "--role", role
-                ]
-                self._run_command(cmd, f"Failed to grant role: {role}")
-            except subprocess.CalledProcessError:
-                logger.warning(f"Role {role} may already be granted or you may not have permissions")
-        
-        # Create and download service account key
-        self.service_account_key_path = os.path.join(self.temp_dir, "service-account-key.json")
+        try:
+            self._grant_roles(roles)
+        except subprocess.CalledProcessError:
+            # Fall back to binding roles one at a time so a single bad role doesn't block the rest
+            logger.warning("Could not update the project IAM policy in one call, granting roles individually")
+            for role in roles:
+                try:
+                    cmd = [
+                        "gcloud", "projects", "add-iam-policy-binding", self.config.project_id,
+                        "--member", f"serviceAccount:{self.service_account_email}",
+                        "--role", role
+                    ]
+                    self._run_command(cmd, f"Failed to grant role: {role}")
+                except subprocess.CalledProcessError:
+                    logger.warning(f"Role {role} may already be granted or you may not have permissions")
+        
+        # Create and download service account key (path was fixed in __init__)
         cmd = [
             "gcloud", "iam", "service-accounts", "keys", "create", self.service_account_key_path,
             "--iam-account", self.service_account_email,
             "--project", self.config.project_id
         ]
-        self._run_command(cmd, "Failed to create service account key")
+        # Not retried: a create that went through server-side would leave an extra key behind
+        self._raise_if_aborted("creating a service account key")
+        self._run_command(cmd, "Failed to create service account key", retry=False)
         
         # Create Secret Manager secret with the service account key
-        self._create_secret_manager_secret()
+        with open(self.service_account_key_path, 'rb') as f:
+            key_data = f.read()
+        self._create_secret_manager_secret(key_data)
         
         logger.info(f"Service account ready: {self.service_account_email}")
     
-    def _create_secret_manager_secret(self):
-        """Create Secret Manager secret with the service account key"""
+    def _grant_roles(self, roles: List[str]):
+        """Grant roles to the service account with a single read-modify-write of the project IAM policy"""
+        member = f"serviceAccount:{self.service_account_email}"
+        
+        cmd = ["gcloud", "projects", "get-iam-policy", self.config.project_id, "--format=json"]
+        policy = json.loads(self._run_command(cmd, "Failed to read project IAM policy", capture=True))
+        
+        bindings = policy.setdefault('bindings', [])
+        missing_roles = []
+        for role in roles:
+            binding = next((b for b in bindings if b['role'] == role and 'condition' not in b), None)
+            if binding is None:
+                bindings.append({'role': role, 'members': [member]})
+                missing_roles.append(role)
+            elif member not in binding['members']:
+                binding['members'].append(member)
+                missing_roles.append(role)
+        
+        if not missing_roles:
+            logger.info("Service account already has all required roles")
+            return
+        
+        # The policy keeps its etag, so a concurrent change makes this fail instead of being overwritten
+        policy_path = os.path.join(self.temp_dir, "iam_policy.json")
+        with open(policy_path, 'w') as f:
+            json.dump(policy, f)
+        
+        logger.info(f"Granting roles: {', '.join(missing_roles)}")
+        cmd = ["gcloud", "projects", "set-iam-policy", self.config.project_id, policy_path, "--format=none"]
+        self._run_command(cmd, "Failed to update project IAM policy")
+    
+    def _create_secret_manager_secret(self, key_data: bytes):
+        """Create Secret Manager secret holding the given service account key bytes"""
+        from google.api_core.exceptions import AlreadyExists, GoogleAPICallError
+        
         secret_name = self.naming.secret_name
         
         logger.info(f"Creating Secret Manager secret: {secret_name}")
         
-        # Check if secret already exists
+        # Create the secret, then store the key as a new version - works whether or not it already existed
         try:
-            cmd = [
-                "gcloud", "secrets", "describe", secret_name,
-                "--project", self.config.project_id
-            ]
-            self._run_command(cmd, "Failed to check secret existence")
+            with _api_call_slots:
+                self._secret_client.create_secret(
+                    parent=f"projects/{self.config.project_id}",
+                    secret_id=secret_name,
+                    secret={"replication": {"automatic": {}}},
+                    retry=_api_retry()
+                )
+            logger.info(f"Created new Secret Manager secret: {secret_name}")
+        except AlreadyExists:
             logger.info(f"Secret {secret_name} already exists, updating with new version")
-            
-            # Add new version to existing secret
-            cmd = [
-                "gcloud", "secrets", "versions", "add", secret_name,
-                "--project", self.config.project_id,
-                "--data-file", self.service_account_key_path
-            ]
-            self._run_command(cmd, "Failed to add new secret version")
-            
-        except subprocess.CalledProcessError:
-            # Secret doesn't exist, create it
-            logger.info(f"Creating new Secret Manager secret: {secret_name}")
-            cmd = [
-                "gcloud", "secrets", "create", secret_name,
-                "--project", self.config.project_id,
-                "--data-file", self.service_account_key_path
-            ]
-            self._run_command(cmd, "Failed to create Secret Manager secret")
+        
+        with _api_call_slots:
+            self._secret_client.add_secret_version(
+                parent=self._secret_client.secret_path(self.config.project_id, secret_name),
+                payload={"data": key_data},
+                retry=_api_retry()
+            )
         
         # Grant Cloud Run service account access to the secret
         logger.info("Granting Cloud Run service account access to Secret Manager secret")
         try:
-            # Get project number for Cloud Run service account
-            cmd = [
-                "gcloud", "projects", "describe", self.config.project_id,
-                "--format", "value(projectNumber)"
-            ]
-            project_number = self._run_command(cmd, "Failed to get project number").strip()
-            
-            cloud_run_sa = f"{project_number}-compute@developer.gserviceaccount.com"
+            cloud_run_sa = f"{self.project_number}-compute@developer.gserviceaccount.com"
             logger.info(f"Granting access to Cloud Run service account: {cloud_run_sa}")
             
-            cmd = [
-                "gcloud", "secrets", "add-iam-policy-binding", secret_name,
-                "--member", f"serviceAccount:{cloud_run_sa}",
-                "--role", "roles/secretmanager.secretAccessor",
-                "--project", self.config.project_id
-            ]
-            self._run_command(cmd, "Failed to grant Cloud Run service account access to secret")
+            # Same read-modify-write as gcloud secrets add-iam-policy-binding, on the existing client
+            role = "roles/secretmanager.secretAccessor"
+            member = f"serviceAccount:{cloud_run_sa}"
+            secret_path = self._secret_client.secret_path(self.config.project_id, secret_name)
+            with _api_call_slots:
+                policy = self._secret_client.get_iam_policy(request={"resource": secret_path}, retry=_api_retry())
+            if not any(binding.role == role and member in binding.members for binding in policy.bindings):
+                policy.bindings.add(role=role, members=[member])
+                with _api_call_slots:
+                    self._secret_client.set_iam_policy(request={"resource": secret_path, "policy": policy}, retry=_api_retry())
             
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, GoogleAPICallError) as e:
             logger.warning(f"Failed to grant Cloud Run service account access: {e}")
             logger.warning("You may need to grant this permission manually during deployment")
         
@@ -447,18 +738,12 @@ class ContractorEnvironmentSetup:
         """Create BigQuery dataset in the contractor project"""
         logger.info(f"Creating BigQuery dataset: {self.config.target_dataset}")
         
-        cmd = [
-            "bq", "mk", 
-            "--project_id", self.config.project_id,
-            "--dataset", 
-            f"{self.config.project_id}:{self.config.target_dataset}"
-        ]
+        from google.cloud import bigquery
         
-        try:
-            self._run_command(cmd, "Failed to create BigQuery dataset")
-            logger.info(f"BigQuery dataset {self.config.target_dataset} created successfully")
-        except subprocess.CalledProcessError:
-            logger.info(f"BigQuery dataset {self.config.target_dataset} may already exist")
+        dataset = bigquery.Dataset(f"{self.config.project_id}.{self.config.target_dataset}")
+        with _api_call_slots:
+            self._bq_client.create_dataset(dataset, exists_ok=True)
+        logger.info(f"BigQuery dataset {self.config.target_dataset} is ready")
     
     def _copy_and_anonymize_data(self):
         """Copy data from production to dev environment using custom SQL templates"""
@@ -468,14 +753,38 @@ class ContractorEnvironmentSetup:
         master_config = self._load_master_config()
         table_copy_configs = master_config.get('table_copy_configs', {})
         
-        # Copy each specified table using its custom SQL template
-        for table_name in self.config.tables_to_copy:
-            self._copy_table_using_template(table_name, table_copy_configs)
+        # Lookup tables go first: a template joining one that isn't there yet would fail and fall back
+        # to a direct copy, handing the contractor un-anonymized data
+        lookup_tables = [
+            table_name for table_name in self.config.tables_to_copy
+            if table_name in LOOKUP_TABLES or table_copy_configs.get(table_name, {}).get('copy_first')
+        ]
+        other_tables = [table_name for table_name in self.config.tables_to_copy if table_name not in lookup_tables]
+        
+        # Within each wave, every worker starts a table's job and waits on it (including any direct-copy
+        # fallback), so BigQuery runs the copies concurrently with at most MAX_CONCURRENT_TABLE_COPIES in flight
+        copy_table = _in_log_context(lambda table_name: self._copy_table_using_template(table_name, table_copy_configs))
+        for tables in (lookup_tables, other_tables):
+            if not tables:
+                continue
+            with ThreadPoolExecutor(max_workers=min(len(tables), MAX_CONCURRENT_TABLE_COPIES)) as executor:
+                list(executor.map(copy_table, tables))
         
         logger.info("Data copying completed using custom SQL templates")
     
     def _copy_table_using_template(self, table_name: str, table_copy_configs: dict):
         """Copy a table using the specified SQL template"""
+        self._raise_if_aborted(f"copying table {table_name}")
+        job, query_template = self._start_table_copy(table_name, table_copy_configs)
+        self._finish_table_copy(table_name, job, query_template)
+    
+    def _start_table_copy(self, table_name: str, table_copy_configs: dict):
+        """
+        Start the BigQuery job that copies a table using its configured SQL template
+        
+        Returns:
+            Tuple of (started job, template name or None if it is a direct copy)
+        """
         # Get the configuration for this table
         table_config = table_copy_configs.get(table_name, {})
         query_template = table_config.get('query_template', 'copy_direct.sql')  # Default to simple copy
@@ -483,51 +792,125 @@ class ContractorEnvironmentSetup:
         
         logger.info(f"Copying table '{table_name}' using template '{query_template}': {description}")
         
+        # A plain copy needs no SQL - a copy job duplicates storage without scanning the table
+        if query_template == 'copy_direct.sql':
+            return self._start_direct_copy(table_name), None
+        
         # Load the SQL template
-        template_path = os.path.join('queries', query_template)
-        if not os.path.exists(template_path):
+        template_path = QUERIES_DIR / query_template
+        query_template_content = _read_query_template(template_path)
+        if query_template_content is None:
             logger.warning(f"Query template not found: {template_path}. Using direct copy.")
             # Fallback to simple copy
-            self._copy_table_direct(table_name)
-            return
+            return self._start_direct_copy(table_name), None
         
-        with open(template_path, 'r') as f:
-            query_template_content = f.read()
+        # Templates that still only SELECT * from the source (no anonymization added yet) are plain copies too
+        if _PLAIN_COPY_SQL_RE.fullmatch(_SQL_COMMENT_RE.sub('', query_template_content)):
+            logger.info(f"Template {query_template} has no transformation, using a copy job")
+            return self._start_direct_copy(table_name), None
         
         # Prepare template parameters
-        source_table = f"{self.config.source_project}.{self.config.source_dataset}.{table_name}"
-        target_table = f"{self.config.project_id}.{self.config.target_dataset}.{table_name}"
+        source_table, target_table = self._table_ids(table_name)
         
         # Replace parameters in the template
-        query = query_template_content.format(
-            source_table=source_table,
-            target_table=target_table,
-            source_project=self.config.source_project,
-            source_dataset=self.config.source_dataset,
-            target_project=self.config.project_id,
-            target_dataset=self.config.target_dataset,
-            table_name=table_name
+        query = query_template_content.format_map({
+            **self._template_params,
+            'source_table': source_table,
+            'target_table': target_table,
+            'table_name': table_name,
+        })
+        
+        # Submit the query without waiting for it
+        logger.info(f"Running BigQuery query: {query}")
+        try:
+            with _api_call_slots:
+                return self._bq_client.query(query), query_template
+        except Exception as e:
+            logger.error(f"Failed to copy table {table_name} using template {query_template}: {e}")
+            logger.info(f"Falling back to direct copy method for {table_name}")
+            return self._start_direct_copy(table_name), None
+    
+    @functools.cached_property
+    def _dataset_prefixes(self) -> Tuple[str, str]:
+        """Fully qualified source and target dataset IDs, built once for every table"""
+        return (
+            f"{self.config.source_project}.{self.config.source_dataset}",
+            f"{self.config.project_id}.{self.config.target_dataset}",
         )
+    
+    def _table_ids(self, table_name: str) -> Tuple[str, str]:
+        """Fully qualified source and target table IDs for a table name"""
+        source_prefix, target_prefix = self._dataset_prefixes
+        return f"{source_prefix}.{table_name}", f"{target_prefix}.{table_name}"
+    
+    @functools.cached_property
+    def _template_params(self) -> Dict[str, str]:
+        """SQL template parameters that are the same for every table"""
+        return {
+            'source_project': self.config.source_project,
+            'source_dataset': self.config.source_dataset,
+            'target_project': self.config.project_id,
+            'target_dataset': self.config.target_dataset,
+        }
+    
+    def _finish_table_copy(self, table_name: str, job, query_template: Optional[str]):
+        """Wait for a table's copy job, falling back to a direct copy if its template query failed
+        and to CREATE TABLE AS SELECT if the copy job failed or could not be started"""
+        if job is None:
+            self._copy_table_as_select(table_name)
+            return
         
-        # Execute the query
         try:
-            self._run_bigquery_query(query, f"Failed to copy table: {table_name}")
-            logger.info(f"Successfully copied table: {table_name}")
+            self._wait_for_job(job)
         except Exception as e:
+            if self._aborted.is_set():
+                raise
+            if query_template is None:
+                logger.warning(f"Copy job for table {table_name} failed: {e}")
+                self._copy_table_as_select(table_name)
+                return
             logger.error(f"Failed to copy table {table_name} using template {query_template}: {e}")
             # Fallback to simple copy
             logger.info(f"Falling back to direct copy method for {table_name}")
             self._copy_table_direct(table_name)
+            return
+        
+        if query_template is None:
+            logger.info(f"Copied table directly: {table_name}")
+        else:
+            logger.info(f"Successfully copied table: {table_name}")
     
-    def _copy_table_direct(self, table_name: str):
-        """Fallback method: Direct copy without any transformation"""
-        source_table = f"{self.config.source_project}.{self.config.source_dataset}.{table_name}"
-        target_table = f"{self.config.project_id}.{self.config.target_dataset}.{table_name}"
+    def _start_direct_copy(self, table_name: str):
+        """Start a BigQuery copy job that duplicates a table without any transformation
         
-        query = f"CREATE OR REPLACE TABLE `{target_table}` AS SELECT * FROM `{source_table}`"
+        Returns:
+            The started job, or None if BigQuery refused it (views and external tables can't be copied)
+        """
+        from google.cloud import bigquery
+        
+        source_table, target_table = self._table_ids(table_name)
+        
+        # WRITE_TRUNCATE overwrites an existing target table, matching CREATE OR REPLACE semantics
+        job_config = bigquery.CopyJobConfig(write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE)
+        try:
+            with _api_call_slots:
+                return self._bq_client.copy_table(source_table, target_table, job_config=job_config)
+        except Exception as e:
+            logger.warning(f"Could not start a copy job for table {table_name}: {e}")
+            return None
+    
+    def _copy_table_as_select(self, table_name: str):
+        """Copy a table with CREATE OR REPLACE TABLE ... AS SELECT, which also handles views and external tables"""
+        source_table, target_table = self._table_ids(table_name)
         
+        logger.info(f"Falling back to CREATE TABLE AS SELECT for {table_name}")
+        query = f"CREATE OR REPLACE TABLE `{target_table}` AS SELECT * FROM `{source_table}`"
         self._run_bigquery_query(query, f"Failed to copy table: {table_name}")
-        logger.info(f"Copied table directly: {table_name}")
+        logger.info(f"Copied table with a query: {table_name}")
+    
+    def _copy_table_direct(self, table_name: str):
+        """Direct copy without any transformation, using a BigQuery copy job instead of a query"""
+        self._finish_table_copy(table_name, self._start_direct_copy(table_name), None)
     
     def _copy_canonical_names_table(self):
         """Copy the canonical company names table for anonymization - DEPRECATED"""
@@ -543,8 +926,7 @@ class ContractorEnvironmentSetup:
     
     def _copy_table_with_anonymization_fallback(self, table_name: str):
         """Fallback method: Copy a table from production with company name anonymization"""
-        source_table = f"{self.config.source_project}.{self.config.source_dataset}.{table_name}"
-        target_table = f"{self.config.project_id}.{self.config.target_dataset}.{table_name}"
+        source_table, target_table = self._table_ids(table_name)
         canonical_table = f"{self.config.project_id}.{self.config.target_dataset}.canonical_company_names_sa"
         
         # For tables with company_name, apply anonymization
@@ -569,32 +951,38 @@ class ContractorEnvironmentSetup:
         """Create GitHub repository and upload contractor files"""
         repo_name = self.naming.github_repo_name
         
-        # Get GitHub owner from master config
+        # Get GitHub owner from master config; without one gh creates the repo under the authenticated user
         master_config = self._load_master_config()
-        github_owner = master_config.get('github_owner', 'YOUR_USERNAME')
+        github_owner = master_config.get('github_owner')
+        if github_owner in (None, '', 'YOUR_USERNAME'):
+            github_owner = None
         
         # Create repository using GitHub CLI
         cmd = [
-            "gh", "repo", "create", repo_name,
+            "gh", "repo", "create", f"{github_owner}/{repo_name}" if github_owner else repo_name,
             "--private",
-            "--description", f"Development environment for contractor {self.config.contractor_name}",
-            "--clone"
+            "--description", f"Development environment for contractor {self.config.contractor_name}"
         ]
         
         try:
-            self._run_command(cmd, "Failed to create GitHub repository")
+            # Not retried: a create that went through server-side would come back as "already exists"
+            output = self._run_command(cmd, "Failed to create GitHub repository", capture=True, retry=False)
         except subprocess.CalledProcessError:
             logger.warning("GitHub CLI not available or not authenticated. Please create repository manually.")
-            return f"https://github.com/{github_owner}/{repo_name}"
+            return f"https://github.com/{github_owner or 'YOUR_USERNAME'}/{repo_name}"
+        
+        # Push to and share the repo gh actually created, whoever it ended up belonging to
+        repo_url = self._github_repo_url(output, cmd[3])
+        repo_full_name = repo_url.removeprefix("https://github.com/")
         
-        # Copy files to repository
+        # Build the repository locally (the remote is empty, so there is nothing to clone)
         repo_path = os.path.join(os.getcwd(), repo_name)
-        self._setup_repo_files(repo_path)
+        self._setup_repo_files(repo_path, f"{repo_url}.git")
         
         # Add contractor as collaborator
         if self.config.github_username:
             cmd = [
-                "gh", "api", f"repos/{github_owner}/{repo_name}/collaborators/{self.config.github_username}",
+                "gh", "api", f"repos/{repo_full_name}/collaborators/{self.config.github_username}",
                 "--method", "PUT",
                 "--field", "permission=push"
             ]
@@ -603,12 +991,27 @@ class ContractorEnvironmentSetup:
             except subprocess.CalledProcessError:
                 logger.warning(f"Failed to add {self.config.github_username} as collaborator. Please add manually.")
         
-        return f"https://github.com/{github_owner}/{repo_name}"
+        return repo_url
     
-    def _setup_repo_files(self, repo_path: str):
-        """Set up files in the GitHub repository"""
-        # Copy service account key
-        shutil.copy2(self.service_account_key_path, os.path.join(repo_path, "service-account-key.json"))
+    def _github_repo_url(self, create_output: str, repo: str) -> str:
+        """URL of a repository gh just created: from its output, or else looked up with gh repo view"""
+        match = _GITHUB_REPO_URL_RE.search(create_output)
+        if match:
+            return match.group(0)
+        cmd = ["gh", "repo", "view", repo, "--json", "url", "--jq", ".url"]
+        return self._run_command(cmd, "Failed to look up GitHub repository URL", capture=True).strip()
+    
+    def _setup_repo_files(self, repo_path: str, remote_url: str):
+        """Set up files in a new local repository and push them to the GitHub remote"""
+        os.makedirs(repo_path, exist_ok=True)
+        self._run_command(["git", "init", "-b", "main"], "Failed to initialize git repository", cwd=repo_path)
+        
+        # Link the service account key into the repo (plain byte copy if on another filesystem)
+        key_dest = os.path.join(repo_path, self.naming.service_account_key_filename)
+        try:
+            os.link(self.service_account_key_path, key_dest)
+        except OSError:
+            shutil.copyfile(self.service_account_key_path, key_dest)
         
         # Copy example script with updated configuration
         self._copy_and_update_example_script(repo_path)
@@ -616,7 +1019,7 @@ class ContractorEnvironmentSetup:
         # Create README
         self._create_repo_readme(repo_path)
         
-        # Create requirements.txt
+        # Create requirements.txt and requirements.lock
         self._create_requirements_file(repo_path)
         
         # Create deployment files
@@ -625,196 +1028,50 @@ class ContractorEnvironmentSetup:
         self._create_dockerignore(repo_path)
         self._create_test_script(repo_path)
         
-        # Commit and push
-        os.chdir(repo_path)
-        self._run_command(["git", "add", "."], "Failed to add files to git")
-        self._run_command(["git", "commit", "-m", "Initial contractor environment setup"], "Failed to commit files")
-        self._run_command(["git", "push", "origin", "main"], "Failed to push to GitHub")
-        os.chdir("..")
+        # Commit and push (run git inside the repo rather than changing the process CWD)
+        self._run_command(["git", "add", "."], "Failed to add files to git", cwd=repo_path)
+        self._run_command(["git", "commit", "-m", "Initial contractor environment setup"], "Failed to commit files", cwd=repo_path)
+        self._run_command(["git", "remote", "add", "origin", remote_url], "Failed to add GitHub remote", cwd=repo_path)
+        self._run_command(["git", "push", "-u", "origin", "main"], "Failed to push to GitHub", cwd=repo_path)
     
     def _copy_and_update_example_script(self, repo_path: str):
         """Copy and update the example script with new project configuration"""
-        source_script = "initial_reference/example_of_type_of_script_contractor_would_edit.py"
-        target_script = os.path.join(repo_path, "risk_rating_calculator.py")
-        
         # Read the original script
-        with open(source_script, 'r') as f:
-            content = f.read()
+        content = Path("initial_reference/example_of_type_of_script_contractor_would_edit.py").read_text(encoding='utf-8')
         
-        # Update project references
-        content = content.replace('"assembled-wh"', f'"{self.config.project_id}"')
-        content = content.replace('BIGQUERY_PROJECT = "assembled-wh"', f'BIGQUERY_PROJECT = "{self.config.project_id}"')
-        content = content.replace('CLOUD_RUN_PROJECT = "915401990209"', f'CLOUD_RUN_PROJECT = "{self.config.project_id}"')
+        # Update project references (BIGQUERY_PROJECT is covered by the quoted "assembled-wh" match)
+        replacements = {
+            '"assembled-wh"': f'"{self.config.project_id}"',
+            'CLOUD_RUN_PROJECT = "915401990209"': f'CLOUD_RUN_PROJECT = "{self.config.project_id}"',
+        }
+        content = _EXAMPLE_PROJECT_REF_RE.sub(lambda match: replacements[match.group(0)], content)
         
         # Write updated script
-        with open(target_script, 'w') as f:
-            f.write(content)
+        _write_if_changed(Path(repo_path, "risk_rating_calculator.py"), content)
+    
+    @functools.cached_property
+    def _troubleshooting_section(self) -> str:
+        """Troubleshooting section shared by the repo README and the contractor instructions"""
+        return _read_template("troubleshooting.md.tmpl").format(project_id=self.config.project_id).rstrip("\n")
     
     def _create_repo_readme(self, repo_path: str):
         """Create README for the contractor repository"""
-        readme_content = f"""# Development Environment for {self.config.contractor_name}
-
-This repository contains your development environment for working on the risk rating calculator. **This environment is designed to be production-ready and easily portable to other deployment environments.**
-
-## 🏗️ Architecture Overview
-
-This development environment follows production best practices to ensure your code can be seamlessly deployed to various environments (staging, production, client environments) without modification.
-
-### Credential Management Strategy
-
-The application uses a **dual-credential approach** for maximum portability:
-
-1. **Primary (Production)**: Secret Manager - `bellaventure_service_account_json`
-2. **Fallback (Development)**: Local file - `service-account-key.json`
-
-This design ensures:
-- ✅ **Zero code changes** when moving from development to production
-- ✅ **Easy deployment** to client environments using their Secret Manager
-- ✅ **Development convenience** with local files
-- ✅ **Security best practices** for production deployments
-
-## Setup Instructions
-
-1. **Install Dependencies**
-   ```bash
-   pip install -r requirements.txt
-   ```
-
-2. **Authentication (Automatic)**
-   - The application automatically handles credential loading
-   - In this dev environment: Uses Secret Manager first, falls back to local file
-   - In production: Will use Secret Manager seamlessly
-   - No configuration changes needed!
-
-3. **Running the Application**
-   ```bash
-   python risk_rating_calculator.py
-   ```
-
-## 🚀 Production Deployment
-
-When deploying to production or client environments:
-
-1. **Create Secret Manager secret** in target project:
-   ```bash
-   gcloud secrets create bellaventure_service_account_json \\
-     --project=TARGET_PROJECT_ID \\
-     --data-file=path/to/service-account-key.json
-   ```
-
-2. **Deploy your code** - no changes needed!
-   - The application will automatically use Secret Manager
-   - Same code works in development and production
-
-3. **Environment Variables** (optional):
-   ```bash
-   export GOOGLE_CLOUD_PROJECT=TARGET_PROJECT_ID
-   ```
-
-## Project Information
-
-- **GCP Project ID**: `{self.config.project_id}`
-- **BigQuery Dataset**: `{self.config.target_dataset}`
-- **Service Account**: `{self.service_account_email}`
-- **Secret Manager Secret**: `bellaventure_service_account_json`
-
-## Available Tables
-
-The following tables have been copied from production with anonymized company names:
-
-{chr(10).join(f"- `{self.config.project_id}.{self.config.target_dataset}.{table}`" for table in self.config.tables_to_copy)}
-- `{self.config.project_id}.{self.config.target_dataset}.canonical_company_names_sa` (anonymization lookup)
-
-## 🔒 Data Privacy & Security
-
-### Anonymization
-- All company names have been anonymized using a canonical lookup table
-- Financial data is real and accurate, only company identities are protected
-- The `canonical_company_names_sa` table maps real names to anonymized versions
-
-### Security Features
-- Service account has minimal required permissions
-- Isolated development project prevents access to production
-- Private repository keeps code and credentials secure
-- Secret Manager provides secure credential storage
-
-## Development Guidelines
-
-1. **Code Portability**: Write code that works in any GCP project
-   - Use environment variables for project IDs when possible
-   - Leverage the automatic credential loading system
-   - Avoid hardcoding project-specific values
-
-2. **Testing**: Test thoroughly in this development environment
-   - All production data patterns are represented (anonymized)
-   - Same APIs and services as production
-   - Identical data schemas and relationships
-
-3. **Documentation**: Document any changes you make
-   - Update this README if you add new dependencies
-   - Comment your code for future maintainability
-   - Note any environment-specific configurations
-
-4. **Dependencies**: Keep `requirements.txt` updated
-   - Use latest stable package versions
-   - Add any new packages you install
-   - Test that fresh installs work correctly
-
-## 🔧 Troubleshooting
-
-### Credential Issues
-```bash
-# Check if Secret Manager secret exists
-gcloud secrets list --project={self.config.project_id}
-
-# Verify local file exists
-ls -la service-account-key.json
-
-# Test BigQuery access
-python -c "from risk_rating_calculator import get_bigquery_credentials; print('✅ Credentials loaded successfully')"
-```
-
-### Common Issues
-- **Import errors**: Run `pip install -r requirements.txt`
-- **Permission denied**: Ensure you're using the correct project ID
-- **Table not found**: Verify table names match the available tables listed above
-
-## 📞 Support
-
-If you have any questions or issues:
-1. Create an issue in this repository
-2. Check the troubleshooting section above
-3. Contact: greg@bellaventure.co
-
-## Troubleshooting
-
-### Google Cloud Console Access
-
-If your project doesn't appear in the Google Cloud Console project selector:
-
-1. **Verify you're using the correct Google account** - Make sure you're logged into the console with the same account that has access to the project
-2. **Access the project directly** using this URL:
-   ```
-   https://console.cloud.google.com/home/dashboard?project={self.config.project_id}
-   ```
-3. **Clear browser cache** or try an incognito/private window
-4. **Check recent projects** - After accessing via direct URL, the project should appear in your recent projects list
-
-### Common Issues
-
-- **Permission denied**: Ensure you're authenticated with the correct Google account
-- **BigQuery table not found**: Verify you're using the correct project ID in your code
-- **Import errors**: Run `pip install -r requirements.txt` to install all dependencies
-
----
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
+        table_prefix = f"{self.config.project_id}.{self.config.target_dataset}"
+        readme_content = _read_template("README.md.tmpl").format(
+            contractor_name=self.config.contractor_name,
+            project_id=self.config.project_id,
+            target_dataset=self.config.target_dataset,
+            service_account_email=self.service_account_email,
+            tables_list="\n".join([f"- `{table_prefix}.{table}`" for table in self.config.tables_to_copy]),
+            troubleshooting=self._troubleshooting_section,
+            generated_on=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
         
-        with open(os.path.join(repo_path, "README.md"), 'w') as f:
-            f.write(readme_content)
+        # Left alone on a re-run when only the timestamp would change, so git sees no spurious edit
+        _write_if_changed(Path(repo_path, "README.md"), readme_content)
     
     def _create_requirements_file(self, repo_path: str):
-        """Create requirements.txt file"""
+        """Create requirements.txt and the hashed requirements.lock the Docker build installs from"""
         requirements = """google-cloud-bigquery
 google-cloud-secret-manager
 google-auth
@@ -826,554 +1083,196 @@ gunicorn
 requests
 """
         
-        with open(os.path.join(repo_path, "requirements.txt"), 'w') as f:
-            f.write(requirements)
+        _write_if_changed(Path(repo_path, "requirements.txt"), requirements)
+        
+        # Fully pinned with hashes, so the image build skips dependency resolution entirely
+        shutil.copyfile(TEMPLATES_DIR / "requirements.lock.tmpl", Path(repo_path, "requirements.lock"))
     
     def _create_dockerfile(self, repo_path: str):
         """Create Dockerfile for Cloud Run deployment"""
-        dockerfile_content = """# Use Python 3.11 slim image for smaller size and better performance
-FROM python:3.11-slim
-
-# Set working directory
-WORKDIR /app
-
-# Install system dependencies
-RUN apt-get update && apt-get install -y \\
-    gcc \\
-    && rm -rf /var/lib/apt/lists/*
-
-# Copy requirements first for better Docker layer caching
-COPY requirements.txt .
-
-# Install Python dependencies
-RUN pip install --no-cache-dir -r requirements.txt
-
-# Copy application code
-COPY . .
-
-# Create non-root user for security
-RUN useradd --create-home --shell /bin/bash app \\
-    && chown -R app:app /app
-USER app
-
-# Expose port (Cloud Run will set PORT environment variable)
-EXPOSE 8080
-
-# Set environment variables
-ENV PYTHONUNBUFFERED=1
-ENV PORT=8080
-
-# Run the application
-CMD exec gunicorn --bind :$PORT --workers 1 --threads 8 --timeout 0 risk_rating_calculator:app
-"""
-        
-        with open(os.path.join(repo_path, "Dockerfile"), 'w') as f:
-            f.write(dockerfile_content)
+        # Static file: let the OS copy the bytes instead of reading them into Python
+        shutil.copyfile(TEMPLATES_DIR / "Dockerfile.tmpl", Path(repo_path, "Dockerfile"))
 
     def _create_deploy_script(self, repo_path: str):
         """Create deployment script for Cloud Run"""
-        deploy_script_content = f"""#!/bin/bash
-
-# Cloud Run Deployment Script
-# This script deploys the risk rating calculator to Google Cloud Run
-
-set -e
-
-# Configuration - UPDATE THESE VALUES FOR YOUR ENVIRONMENT
-PROJECT_ID="${{GOOGLE_CLOUD_PROJECT:-$(gcloud config get-value project)}}"
-SERVICE_NAME="${{SERVICE_NAME:-{self.naming.cloud_run_service_name}}}"
-REGION="${{REGION:-us-central1}}"
-SECRET_NAME="${{SECRET_NAME:-{self.naming.secret_name}}}"
-
-echo "🚀 Deploying Risk Rating Calculator to Cloud Run"
-echo "Project: $PROJECT_ID"
-echo "Service: $SERVICE_NAME"
-echo "Region: $REGION"
-
-# Check if gcloud is authenticated
-if ! gcloud auth list --filter=status:ACTIVE --format="value(account)" | grep -q .; then
-    echo "❌ Error: Not authenticated with gcloud. Please run 'gcloud auth login'"
-    exit 1
-fi
-
-# Get the current authenticated user
-CURRENT_USER=$(gcloud auth list --filter=status:ACTIVE --format="value(account)")
-echo "🔐 Current authenticated user: $CURRENT_USER"
-
-# Set the project
-gcloud config set project $PROJECT_ID
-
-# Set quota project to match deployment project to avoid quota issues
-echo "🔧 Setting quota project to match deployment project..."
-gcloud auth application-default set-quota-project $PROJECT_ID
-
-# Enable required APIs
-echo "📋 Enabling required APIs..."
-gcloud services enable cloudbuild.googleapis.com
-gcloud services enable run.googleapis.com
-gcloud services enable secretmanager.googleapis.com
-
-# Check if secret exists
-echo "🔐 Checking Secret Manager configuration..."
-if ! gcloud secrets describe $SECRET_NAME --project=$PROJECT_ID >/dev/null 2>&1; then
-    echo "❌ Error: Secret '$SECRET_NAME' not found in project '$PROJECT_ID'"
-    echo "Please create the secret first:"
-    echo "gcloud secrets create $SECRET_NAME --project=$PROJECT_ID --data-file=path/to/service-account-key.json"
-    exit 1
-fi
-
-# Grant Cloud Run service account access to the secret
-echo "🔑 Granting Cloud Run service account access to Secret Manager..."
-PROJECT_NUMBER=$(gcloud projects describe $PROJECT_ID --format="value(projectNumber)")
-CLOUD_RUN_SA="${{PROJECT_NUMBER}}-compute@developer.gserviceaccount.com"
-echo "Cloud Run service account: $CLOUD_RUN_SA"
-
-gcloud secrets add-iam-policy-binding $SECRET_NAME \\
-    --member="serviceAccount:$CLOUD_RUN_SA" \\
-    --role="roles/secretmanager.secretAccessor" \\
-    --project=$PROJECT_ID
-
-# Build and deploy to Cloud Run (REQUIRES AUTHENTICATION)
-echo "🏗️  Building and deploying to Cloud Run..."
-gcloud run deploy $SERVICE_NAME \\
-    --source . \\
-    --platform managed \\
-    --region $REGION \\
-    --no-allow-unauthenticated \\
-    --set-env-vars GOOGLE_CLOUD_PROJECT=$PROJECT_ID \\
-    --memory 1Gi \\
-    --cpu 1 \\
-    --timeout 300 \\
-    --max-instances 10 \\
-    --port 8080
-
-# Grant the current user permission to invoke the service
-echo "🔑 Granting Cloud Run Invoker permission to $CURRENT_USER..."
-gcloud run services add-iam-policy-binding $SERVICE_NAME \\
-    --region=$REGION \\
-    --member="user:$CURRENT_USER" \\
-    --role="roles/run.invoker"
-
-# Get the service URL
-SERVICE_URL=$(gcloud run services describe $SERVICE_NAME --region=$REGION --format="value(status.url)")
-
-echo "✅ Deployment completed successfully!"
-echo "🌐 Service URL: $SERVICE_URL"
-echo "🔐 Authentication: REQUIRED"
-echo "👤 Authorized user: $CURRENT_USER"
-echo ""
-echo "To test the deployment with authentication:"
-echo "# Health check:"
-echo "curl -H \\"Authorization: Bearer \\$(gcloud auth print-identity-token)\\" $SERVICE_URL/health"
-echo ""
-echo "# Process endpoint:"
-echo "curl -X POST -H \\"Authorization: Bearer \\$(gcloud auth print-identity-token)\\" $SERVICE_URL/process"
-"""
-        
-        deploy_script_path = os.path.join(repo_path, "deploy.sh")
-        with open(deploy_script_path, 'w') as f:
-            f.write(deploy_script_content)
+        deploy_script_path = Path(repo_path, "deploy.sh")
+        _write_if_changed(deploy_script_path, _read_template("deploy.sh.tmpl").format(
+            service_name=self.naming.cloud_run_service_name,
+            secret_name=self.naming.secret_name
+        ))
         
         # Make the script executable
         os.chmod(deploy_script_path, 0o755)
 
     def _create_dockerignore(self, repo_path: str):
         """Create .dockerignore file"""
-        dockerignore_content = """# Git files
-.git
-.gitignore
-
-# Python cache
-__pycache__
-*.pyc
-*.pyo
-*.pyd
-.Python
-env
-pip-log.txt
-pip-delete-this-directory.txt
-.tox
-.coverage
-.coverage.*
-.cache
-nosetests.xml
-coverage.xml
-*.cover
-*.log
-.git
-.mypy_cache
-.pytest_cache
-.hypothesis
-
-# Virtual environments
-venv/
-env/
-ENV/
-
-# IDE files
-.vscode/
-.idea/
-*.swp
-*.swo
-*~
-
-# OS files
-.DS_Store
-.DS_Store?
-._*
-.Spotlight-V100
-.Trashes
-ehthumbs.db
-Thumbs.db
-
-# Documentation
-README.md
-*.md
-
-# Development files
-service-account-key.json
-"""
-        
-        with open(os.path.join(repo_path, ".dockerignore"), 'w') as f:
-            f.write(dockerignore_content)
+        shutil.copyfile(TEMPLATES_DIR / "dockerignore.tmpl", Path(repo_path, ".dockerignore"))
 
     def _create_test_script(self, repo_path: str):
         """Create test script for deployment verification"""
-        test_script_content = '''#!/usr/bin/env python3
-"""
-Test script to verify the deployment package is working correctly.
-Run this before submitting your final deliverable.
-"""
-
-import os
-import sys
-import json
-import subprocess
-import requests
-import time
-from pathlib import Path
-
-def test_requirements():
-    """Test that all required packages can be imported"""
-    print("🔍 Testing package imports...")
-    
-    required_packages = [
-        'google.cloud.bigquery',
-        'google.cloud.secretmanager', 
-        'google.auth',
-        'pandas',
-        'numpy',
-        'flask',
-        'pandas_gbq',
-        'gunicorn'
-    ]
-    
-    failed_imports = []
-    for package in required_packages:
-        try:
-            __import__(package)
-            print(f"  ✅ {package}")
-        except ImportError as e:
-            print(f"  ❌ {package}: {e}")
-            failed_imports.append(package)
-    
-    if failed_imports:
-        print(f"\\n❌ Failed to import: {failed_imports}")
-        print("Run: pip install -r requirements.txt")
-        return False
-    
-    print("✅ All packages imported successfully")
-    return True
-
-def test_credentials():
-    """Test that credentials can be loaded"""
-    print("\\n🔍 Testing credential loading...")
-    
-    try:
-        from risk_rating_calculator import get_bigquery_credentials
-        credentials = get_bigquery_credentials()
-        print("✅ Credentials loaded successfully")
-        return True
-    except Exception as e:
-        print(f"❌ Failed to load credentials: {e}")
-        return False
-
-def test_flask_app():
-    """Test that Flask app starts and responds"""
-    print("\\n🔍 Testing Flask app...")
-    
-    # Set environment for server mode
-    os.environ['RUN_MODE'] = 'server'
-    os.environ['PORT'] = '8081'  # Use different port to avoid conflicts
-    
-    try:
-        # Start the Flask app in background
-        import subprocess
-        import time
-        
-        process = subprocess.Popen([
-            sys.executable, 'risk_rating_calculator.py'
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        
-        # Wait for app to start
-        time.sleep(3)
-        
-        # Test health endpoint
-        try:
-            response = requests.get('http://localhost:8081/health', timeout=5)
-            if response.status_code == 200:
-                print("✅ Flask app health check passed")
-                success = True
-            else:
-                print(f"❌ Health check failed with status: {response.status_code}")
-                success = False
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Failed to connect to Flask app: {e}")
-            success = False
-        
-        # Clean up
-        process.terminate()
-        process.wait(timeout=5)
-        
-        return success
-        
-    except Exception as e:
-        print(f"❌ Failed to test Flask app: {e}")
-        return False
-
-def test_docker_files():
-    """Test that Docker files are present and valid"""
-    print("\\n🔍 Testing Docker configuration...")
-    
-    required_files = ['Dockerfile', '.dockerignore', 'deploy.sh']
-    missing_files = []
-    
-    for file in required_files:
-        if not Path(file).exists():
-            missing_files.append(file)
-        else:
-            print(f"  ✅ {file} exists")
-    
-    if missing_files:
-        print(f"❌ Missing files: {missing_files}")
-        return False
-    
-    # Check if deploy.sh is executable
-    if not os.access('deploy.sh', os.X_OK):
-        print("❌ deploy.sh is not executable")
-        return False
-    
-    print("✅ All Docker files present and valid")
-    return True
-
-def test_bigquery_connection():
-    """Test BigQuery connection"""
-    print("\\n🔍 Testing BigQuery connection...")
-    
-    try:
-        from google.cloud import bigquery
-        from risk_rating_calculator import get_bigquery_credentials, BIGQUERY_PROJECT
-        
-        credentials = get_bigquery_credentials()
-        client = bigquery.Client(project=BIGQUERY_PROJECT, credentials=credentials)
-        
-        # Test a simple query
-        query = f"SELECT COUNT(*) as count FROM `{BIGQUERY_PROJECT}.warehouse.ifms` LIMIT 1"
-        result = client.query(query).result()
-        
-        for row in result:
-            print(f"✅ BigQuery connection successful (found {row.count} rows)")
-            return True
-            
-    except Exception as e:
-        print(f"❌ BigQuery connection failed: {e}")
-        return False
-
-def main():
-    """Run all tests"""
-    print("🚀 Testing deployment package...\\n")
-    
-    tests = [
-        ("Requirements", test_requirements),
-        ("Credentials", test_credentials), 
-        ("Docker Files", test_docker_files),
-        ("BigQuery Connection", test_bigquery_connection),
-        ("Flask App", test_flask_app),
-    ]
-    
-    results = {}
-    for test_name, test_func in tests:
-        try:
-            results[test_name] = test_func()
-        except Exception as e:
-            print(f"❌ {test_name} test crashed: {e}")
-            results[test_name] = False
-    
-    # Summary
-    print("\\n" + "="*50)
-    print("📋 TEST SUMMARY")
-    print("="*50)
-    
-    passed = 0
-    total = len(tests)
-    
-    for test_name, result in results.items():
-        status = "✅ PASS" if result else "❌ FAIL"
-        print(f"{test_name:20} {status}")
-        if result:
-            passed += 1
-    
-    print(f"\\nResults: {passed}/{total} tests passed")
-    
-    if passed == total:
-        print("\\n🎉 All tests passed! Your deployment package is ready.")
-        print("\\n📦 Final checklist:")
-        print("- [ ] Code is well documented")
-        print("- [ ] All functionality has been tested")
-        print("- [ ] README.md is updated with any changes")
-        print("- [ ] No sensitive data is committed")
-        return True
-    else:
-        print(f"\\n⚠️  {total - passed} tests failed. Please fix issues before submitting.")
-        return False
-
-if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
-'''
-        
-        with open(os.path.join(repo_path, "test_deployment.py"), 'w') as f:
-            f.write(test_script_content)
+        shutil.copyfile(TEMPLATES_DIR / "test_deployment.py.tmpl", Path(repo_path, "test_deployment.py"))
     
     def _generate_contractor_instructions(self) -> str:
         """Generate detailed instructions for the contractor"""
         instructions_path = self.naming.instructions_filename
         
-        instructions = f"""# Contractor Setup Instructions - {self.config.contractor_name}
-
-## Environment Details
-
-- **Project ID**: `{self.config.project_id}`
-- **GitHub Repository**: [Link will be provided separately]
-- **Service Account**: `{self.service_account_email}`
-
-## Getting Started
-
-1. **Accept GitHub Repository Invitation**
-   - You should receive an email invitation to collaborate on the repository
-   - Accept the invitation and clone the repository
-
-2. **Set Up Local Environment**
-   ```bash
-   git clone [REPOSITORY_URL]
-   cd [REPOSITORY_NAME]
-   pip install -r requirements.txt
-   ```
-
-3. **Verify Access**
-   ```bash
-   python risk_rating_calculator.py
-   ```
-
-## What You Have Access To
-
-- Full read/write access to BigQuery dataset `{self.config.project_id}.{self.config.target_dataset}`
-- Ability to create and deploy Cloud Run services
-- Access to Secret Manager for configuration
-- Full project owner permissions within the development project
-
-## Data Privacy Notes
-
-- All company names have been anonymized using a lookup table
-- Financial data is real but company identities are protected
-- Do not attempt to reverse-engineer company identities
-
-## Deliverables
-
-Please ensure your final code:
-1. Runs successfully in the development environment
-2. Is well-documented with comments
-3. Includes any new dependencies in requirements.txt
-4. Has been tested with the provided data
-
-## Timeline
-
-- Setup completion: [DATE]
-- Development deadline: [DATE]
-- Code review: [DATE]
-
-## Contact
-
-For any questions or issues, please:
-1. Create an issue in the GitHub repository
-2. Email: [YOUR_EMAIL]
-
-## Troubleshooting
-
-### Google Cloud Console Access
-
-If your project doesn't appear in the Google Cloud Console project selector:
-
-1. **Verify you're using the correct Google account** - Make sure you're logged into the console with the same account that has access to the project
-2. **Access the project directly** using this URL:
-   ```
-   https://console.cloud.google.com/home/dashboard?project={self.config.project_id}
-   ```
-3. **Clear browser cache** or try an incognito/private window
-4. **Check recent projects** - After accessing via direct URL, the project should appear in your recent projects list
-
-### Common Issues
-
-- **Permission denied**: Ensure you're authenticated with the correct Google account
-- **BigQuery table not found**: Verify you're using the correct project ID in your code
-- **Import errors**: Run `pip install -r requirements.txt` to install all dependencies
-
----
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
+        template = _read_template("contractor_instructions.md.tmpl")
+        instructions = template.format(
+            contractor_name=self.config.contractor_name,
+            project_id=self.config.project_id,
+            target_dataset=self.config.target_dataset,
+            service_account_email=self.service_account_email,
+            troubleshooting=self._troubleshooting_section,
+            generated_on=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
         
-        with open(instructions_path, 'w') as f:
-            f.write(instructions)
+        # A re-run only changes the "Generated on" footer; keep an otherwise identical file as is
+        if not _write_if_changed(Path(instructions_path), instructions):
+            logger.info(f"Contractor instructions unchanged, keeping {instructions_path}")
         
         return instructions_path
 
+    @functools.cached_property
+    def _bq_client(self):
+        """BigQuery client for the contractor project, created on first use"""
+        # Imported here so --dry-run and --help don't pay for loading the google-cloud stack
+        from google.cloud import bigquery
+        
+        # Uses application default (user) credentials for cross-project queries
+        # (service account doesn't have access to source project)
+        return bigquery.Client(project=self.config.project_id, credentials=_default_credentials())
+    
+    @functools.cached_property
+    def project_number(self) -> str:
+        """Numeric ID of the contractor project (used to name its default compute service account)"""
+        cmd = ["gcloud", "projects", "describe", self.config.project_id, "--format=json"]
+        return json.loads(self._run_command(cmd, "Failed to get project number", capture=True))['projectNumber']
+    
+    @functools.cached_property
+    def _secret_client(self):
+        """Secret Manager client, created on first use"""
+        from google.cloud import secretmanager
+        
+        return secretmanager.SecretManagerServiceClient(credentials=_default_credentials())
+    
+    def _wait_for_job(self, job, timeout: float = 300):
+        """Wait for a BigQuery job (5 minutes at most), cancelling it if the setup is aborted meanwhile"""
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._aborted.is_set():
+                job.cancel()
+                raise RuntimeError(f"Setup aborted, cancelled BigQuery job {job.job_id}")
+            try:
+                return job.result(timeout=max(min(JOB_POLL_SECONDS, deadline - time.monotonic()), 0))
+            except FuturesTimeoutError:
+                if time.monotonic() >= deadline:
+                    raise
+    
     def _run_bigquery_query(self, query: str, error_message: str):
-        """Run a BigQuery query using bq command line tool"""
+        """Run a BigQuery query in-process with the google-cloud-bigquery client"""
         logger.info(f"Running BigQuery query: {query}")
         
-        # Use user credentials for cross-project queries (service account doesn't have access to source project)
-        cmd = [
-            "bq", "query",
-            "--use_legacy_sql=false",
-            "--project_id", self.config.project_id,
-            query
-        ]
-        
         try:
-            self._run_command(cmd, error_message)
-        except subprocess.CalledProcessError:
+            # Only the submission takes an API call slot; the wait for the job doesn't
+            with _api_call_slots:
+                job = self._bq_client.query(query)
+            self._wait_for_job(job)
+        except Exception as e:
+            logger.error(f"{error_message}: {e}")
             logger.error(f"Failed query: {query}")
             raise
     
-    def _run_command(self, cmd: List[str], error_message: str) -> str:
-        """Run a shell command and return output"""
-        try:
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                check=True,
-                timeout=300  # 5 minute timeout
+    def _run_command(self, cmd: List[str], error_message: str, cwd: Optional[str] = None,
+                     capture: bool = False, retry: bool = True, log_failure: bool = True) -> str:
+        """Run a shell command (optionally in another working directory)
+        
+        Output is read line by line as it arrives: stderr (where gcloud/bq/gh report progress)
+        is logged at INFO and stdout at DEBUG, so long-running commands show progress.
+        stdout is only returned when capture is set; otherwise, unless DEBUG logging wants it,
+        it is discarded at the OS level instead of being piped through Python.
+        Failures that look transient (rate limits, 5xx) are retried with exponential backoff,
+        unless retry is False (commands that aren't safe to repeat, such as creating a key).
+        With log_failure=False a final failure is only logged at DEBUG, for callers that expect
+        and handle it (e.g. "already exists" conflicts).
+        At most MAX_CONCURRENT_API_CALLS outbound commands run at once (local git commands don't count);
+        the slot is not held while backing off.
+        """
+        attempts = COMMAND_ATTEMPTS if retry else 1
+        is_local = cmd[0] == "git" and cmd[1] in _LOCAL_GIT_SUBCOMMANDS
+        for attempt in range(1, attempts + 1):
+            with contextlib.nullcontext() if is_local else _api_call_slots:
+                returncode, stdout, stderr = self._run_command_once(cmd, cwd, capture)
+            if returncode == 0:
+                return stdout
+            if attempt < attempts and _TRANSIENT_COMMAND_ERROR_RE.search(stderr):
+                delay = min(60.0, 2.0 ** attempt) + random.uniform(0, 0.5)
+                logger.warning(f"{cmd[0]} hit a transient error (attempt {attempt}/{attempts}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            
+            error = subprocess.CalledProcessError(returncode, cmd, output=stdout, stderr=stderr)
+            if log_failure:
+                self._log_command_failure(error_message, error)
+            else:
+                logger.debug(f"{error_message} (return code {returncode}): {stderr}")
+            raise error
+    
+    @staticmethod
+    def _log_command_failure(error_message: str, error: subprocess.CalledProcessError):
+        """Log a failed command's error output, command line and return code"""
+        logger.error(f"{error_message}: {error.stderr}")
+        logger.error(f"Command that failed: {' '.join(error.cmd)}")
+        logger.error(f"Return code: {error.returncode}")
+    
+    def _run_command_once(self, cmd: List[str], cwd: Optional[str], capture: bool) -> Tuple[int, str, str]:
+        """Run a command a single time, returning (return code, stdout, stderr)"""
+        keep_stdout = capture or logger.isEnabledFor(logging.DEBUG)
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE if keep_stdout else subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE, cwd=cwd)
+        stdout_lines, stderr_lines = [], []
+        readers = [
+            threading.Thread(target=_in_log_context(self._drain_stream), args=(process.stderr, stderr_lines, logging.INFO),
+                             daemon=True),
+        ]
+        if keep_stdout:
+            readers.append(
+                threading.Thread(target=_in_log_context(self._drain_stream), args=(process.stdout, stdout_lines, logging.DEBUG),
+                                 daemon=True)
             )
-            return result.stdout
-        except subprocess.CalledProcessError as e:
-            logger.error(f"{error_message}: {e.stderr}")
-            logger.error(f"Command that failed: {' '.join(cmd)}")
-            logger.error(f"Return code: {e.returncode}")
-            raise
+        for reader in readers:
+            reader.start()
+        
+        try:
+            process.wait(timeout=300)  # 5 minute timeout
         except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
             logger.error(f"Command timed out: {' '.join(cmd)}")
             raise
+        finally:
+            for reader in readers:
+                reader.join()
+        
+        return process.returncode, ''.join(stdout_lines), ''.join(stderr_lines)
+    
+    @staticmethod
+    def _already_exists(error: subprocess.CalledProcessError) -> bool:
+        """Whether a failed gcloud create command failed only because the resource is already there"""
+        stderr = (error.stderr or "").lower()
+        return "already exists" in stderr or "already in use" in stderr
+    
+    @staticmethod
+    def _drain_stream(stream, lines: List[str], level: int):
+        """Collect a subprocess output stream, logging each line as it arrives"""
+        with stream:
+            if not logger.isEnabledFor(level):
+                # Nothing will be logged (stdout at DEBUG, usually), so read and decode it in one go
+                lines.append(stream.read().decode('utf-8', errors='replace'))
+                return
+            for raw_line in iter(stream.readline, b''):
+                line = raw_line.decode('utf-8', errors='replace')
+                lines.append(line)
+                logger.log(level, line.rstrip())
 
     def cleanup(self):
         """Clean up temporary files"""
@@ -1392,39 +1291,32 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
     def _load_master_config(self) -> dict:
         """Load master configuration"""
-        with open("config/master_config.yaml", 'r') as f:
-            return yaml.safe_load(f)
+        return _load_master_config_cached(self.master_config_path)
 
 
 def load_config_from_file(config_path: str, master_config_path: str = "config/master_config.yaml") -> ContractorConfig:
     """Load contractor configuration from YAML file, merging with master config"""
+    import yaml
+    
     try:
         # Load master configuration
         master_config = {}
         if os.path.exists(master_config_path):
-            with open(master_config_path, 'r') as f:
-                master_config = yaml.safe_load(f)
+            master_config = _load_master_config_cached(master_config_path)
             logger.info(f"Loaded master configuration from {master_config_path}")
         else:
             logger.warning(f"Master config file not found: {master_config_path}. Using contractor config only.")
         
         # Load contractor-specific configuration
-        with open(config_path, 'r') as f:
-            contractor_config = yaml.safe_load(f)
+        contractor_config = _load_yaml(config_path)
         
         # Merge configurations (contractor config overrides master config)
         merged_config = merge_configurations(master_config, contractor_config)
         
         # Validate that all required fields are present
-        required_fields = [
-            'contractor_name', 'github_username', 'project_id', 'project_name',
-            'billing_account_id', 'source_project', 'source_dataset', 
-            'target_dataset', 'tables_to_copy'
-        ]
-        
-        missing_fields = [field for field in required_fields if field not in merged_config]
+        missing_fields = REQUIRED_CONFIG_FIELDS - merged_config.keys()
         if missing_fields:
-            raise ValueError(f"Missing required fields in config: {missing_fields}")
+            raise ValueError(f"Missing required fields in config: {sorted(missing_fields)}")
         
         # Validate tables_to_copy is a list
         if not isinstance(merged_config['tables_to_copy'], list):
@@ -1446,11 +1338,13 @@ def load_config_from_file(config_path: str, master_config_path: str = "config/ma
 
 def merge_configurations(master_config: dict, contractor_config: dict) -> dict:
     """Merge master and contractor configurations, with contractor taking precedence"""
-    merged = {}
+    # Contractor values override master values; empty contractor values fall back to the master's
+    merged = {**master_config, **{key: value for key, value in contractor_config.items() if value}}
+    # Keep only the ContractorConfig fields so master-only settings don't leak through
+    merged = {name: merged.get(name) for name in REQUIRED_CONFIG_FIELDS}
     
-    # Start with contractor-specific values
-    contractor_name = contractor_config.get('contractor_name', 'Unknown')
-    github_username = contractor_config.get('github_username', '')
+    contractor_name = merged['contractor_name'] = contractor_config.get('contractor_name', 'Unknown')
+    merged['github_username'] = contractor_config.get('github_username', '')
     
     # Generate project ID if not provided
     if 'project_id' not in contractor_config:
@@ -1468,14 +1362,6 @@ def merge_configurations(master_config: dict, contractor_config: dict) -> dict:
     else:
         merged['project_name'] = contractor_config['project_name']
     
-    # Set required fields from master or contractor config
-    merged['contractor_name'] = contractor_name
-    merged['github_username'] = github_username
-    merged['billing_account_id'] = contractor_config.get('billing_account_id') or master_config.get('billing_account_id')
-    merged['source_project'] = contractor_config.get('source_project') or master_config.get('source_project')
-    merged['source_dataset'] = contractor_config.get('source_dataset') or master_config.get('source_dataset')
-    merged['target_dataset'] = contractor_config.get('target_dataset') or master_config.get('target_dataset')
-    
     # Handle tables_to_copy with contractor type support
     if 'tables_to_copy' in contractor_config:
         merged['tables_to_copy'] = contractor_config['tables_to_copy']
@@ -1497,42 +1383,79 @@ def merge_configurations(master_config: dict, contractor_config: dict) -> dict:
     return merged
 
 
+def setup_all(configs: List[ContractorConfig], max_workers: int = 8,
+              master_config_path: str = "config/master_config.yaml") -> Dict[str, Dict[str, str]]:
+    """
+    Set up several contractor environments concurrently
+    
+    Every step is I/O bound on gcloud/bq/gh subprocesses, so a thread pool is enough.
+    
+    Returns:
+        Dict mapping project ID to that contractor's setup results (or {'error': ...} on failure)
+    """
+    def setup_one(config: ContractorConfig) -> Dict[str, str]:
+        # Tag this thread's log lines with the contractor so interleaved output stays readable
+        _log_context.contractor = config.contractor_name
+        try:
+            return ContractorEnvironmentSetup(config, master_config_path).setup_environment()
+        finally:
+            _log_context.contractor = None
+    
+    all_results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(setup_one, config): config for config in configs}
+        for future in as_completed(futures):
+            config = futures[future]
+            try:
+                all_results[config.project_id] = future.result()
+            except Exception as e:
+                logger.error(f"Setup failed for {config.contractor_name}: {e}")
+                all_results[config.project_id] = {'error': str(e)}
+    return all_results
+
+
 def main():
     """Main entry point"""
     import argparse
     
     parser = argparse.ArgumentParser(description="Set up contractor development environment")
-    parser.add_argument("--config", required=True, help="Path to contractor configuration YAML file")
+    parser.add_argument("--config", required=True, nargs='+', help="Path to contractor configuration YAML file (several may be given to set up contractors in parallel)")
     parser.add_argument("--master-config", default="config/master_config.yaml", help="Path to master configuration file (default: config/master_config.yaml)")
+    parser.add_argument("--max-workers", type=int, default=8, help="Maximum contractors to set up at once when several configs are given (default: 8)")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be done without executing")
     
     args = parser.parse_args()
     
     # Load configuration
-    config = load_config_from_file(args.config, args.master_config)
+    configs = [load_config_from_file(config_path, args.master_config) for config_path in args.config]
     
     if args.dry_run:
         logger.info("DRY RUN MODE - No changes will be made")
-        logger.info(f"Would set up environment for: {config.contractor_name}")
-        logger.info(f"Project ID: {config.project_id}")
-        logger.info(f"Project Name: {config.project_name}")
-        logger.info(f"GitHub Username: {config.github_username}")
-        logger.info(f"Billing Account: {config.billing_account_id}")
-        logger.info(f"Source Project: {config.source_project}")
-        logger.info(f"Tables to copy: {config.tables_to_copy}")
+        for config in configs:
+            logger.info(f"Would set up environment for: {config.contractor_name}")
+            logger.info(f"Project ID: {config.project_id}")
+            logger.info(f"Project Name: {config.project_name}")
+            logger.info(f"GitHub Username: {config.github_username}")
+            logger.info(f"Billing Account: {config.billing_account_id}")
+            logger.info(f"Source Project: {config.source_project}")
+            logger.info(f"Tables to copy: {config.tables_to_copy}")
         return
     
-    # Set up environment
-    setup = ContractorEnvironmentSetup(config)
-    results = setup.setup_environment()
+    # Set up environment(s)
+    if len(configs) == 1:
+        setup = ContractorEnvironmentSetup(configs[0], args.master_config)
+        all_results = {configs[0].project_id: setup.setup_environment()}
+    else:
+        all_results = setup_all(configs, max_workers=args.max_workers, master_config_path=args.master_config)
     
     # Print results
-    print("\n" + "="*50)
-    print("CONTRACTOR ENVIRONMENT SETUP RESULTS")
-    print("="*50)
-    for key, value in results.items():
-        print(f"{key}: {value}")
-    print("="*50)
+    for results in all_results.values():
+        print("\n" + "="*50)
+        print("CONTRACTOR ENVIRONMENT SETUP RESULTS")
+        print("="*50)
+        for key, value in results.items():
+            print(f"{key}: {value}")
+        print("="*50)
 
 
 if __name__ == "__main__":
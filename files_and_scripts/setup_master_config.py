@@ -4,34 +4,152 @@ Interactive Master Configuration Setup
 
 This script helps you set up your master_config.yaml file by gathering
 your authentication IDs and organizational defaults interactively.
+Pass --answers-file to generate it in one go without prompts (e.g. from CI).
 """
 
-import subprocess
-import yaml
+import functools
+import json
+import sys
+import time
 import os
+from pathlib import Path
 
+BILLING_ACCOUNTS_URL = "https://cloudbilling.googleapis.com/v1/billingAccounts"
+
+# Defaults offered by the prompts, also used for anything an answers file leaves out
+DEFAULT_ANSWERS = {
+    'source_project': "assembled-wh",
+    'source_dataset': "warehouse",
+    'target_dataset': "warehouse",
+    'default_tables': ["ifms", "ifms_consolidated", "ifms_wa", "ifms_consolidated_ttm_avg_data"],
+    'project_id_prefix': "contractor",
+    'project_id_suffix': "dev-2024",
+    'contact_info': {'email': "", 'slack': ""}
+}
+
+# Fixed parts of the generated master config
+PROJECT_NAME_TEMPLATE = "Contractor {contractor_name} Development Environment"
+CONTRACTOR_ROLES = (
+    "roles/bigquery.admin",
+    "roles/run.admin",
+    "roles/secretmanager.admin",
+    "roles/storage.admin",
+    "roles/cloudbuild.builds.editor"
+)
+STANDARD_CONTRACTOR_ROLES = (
+    "roles/bigquery.admin",
+    "roles/run.admin"
+)
+GITHUB_REPO_SETTINGS = {
+    'private': True,
+    'default_branch': "main"
+}
+NOTIFICATION_SETTINGS = {
+    'slack_webhook': "",
+    'email_notifications': True
+}
+
+PROBE_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'create-dev-environment'
+PROBE_CACHE_TTL = 60 * 60  # seconds; long enough for a quick re-run, short enough that new accounts show up
+
+def _yes(prompt):
+    """Ask a y/n question; anything starting with y or Y counts as yes"""
+    return input(prompt)[:1] in ('y', 'Y')
+
+def _credentials_fingerprint(*paths, env_vars=()):
+    """Cheap stand-in for "which account is signed in", hashed from credential file mtimes and token variables
+    
+    Signing in again or switching accounts rewrites the files (or changes the variables), so a cached
+    probe result stops matching without having to ask the API who the current account is.
+    """
+    import hashlib
+    
+    parts = []
+    for path in paths:
+        try:
+            parts.append(f"{path}:{path.stat().st_mtime_ns}")
+        except OSError:
+            parts.append(f"{path}:missing")
+    parts.extend(f"{name}={os.environ.get(name, '')}" for name in env_vars)
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+def _adc_fingerprint():
+    """Fingerprint of the application default credentials the billing probe uses"""
+    gcloud_config = Path(os.environ.get('CLOUDSDK_CONFIG') or Path.home() / '.config' / 'gcloud')
+    adc_path = Path(os.environ.get('GOOGLE_APPLICATION_CREDENTIALS') or gcloud_config / 'application_default_credentials.json')
+    return _credentials_fingerprint(adc_path)
+
+def _gh_fingerprint():
+    """Fingerprint of the gh CLI login the GitHub probe uses"""
+    gh_config = Path(
+        os.environ.get('GH_CONFIG_DIR')
+        or Path(os.environ.get('XDG_CONFIG_HOME') or Path.home() / '.config') / 'gh'
+    )
+    return _credentials_fingerprint(gh_config / 'hosts.yml', env_vars=('GH_TOKEN', 'GITHUB_TOKEN', 'GH_HOST'))
+
+def _disk_cached(account_fingerprint):
+    """Remember a probe's successful result on disk for PROBE_CACHE_TTL seconds, for the account it was made with"""
+    def decorator(func):
+        cache_path = PROBE_CACHE_DIR / f"{func.__name__}.json"
+        
+        @functools.wraps(func)
+        def wrapper():
+            account = account_fingerprint()
+            try:
+                if time.time() - cache_path.stat().st_mtime < PROBE_CACHE_TTL:
+                    entry = json.loads(cache_path.read_text())
+                    if isinstance(entry, dict) and entry.get('account') == account:
+                        return entry['result']
+            except (OSError, ValueError, KeyError):
+                pass  # no usable cache entry, so probe for real
+            
+            result = func()
+            if result:  # failures and empty answers are retried next run rather than remembered
+                try:
+                    PROBE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                    cache_path.write_text(json.dumps({'account': account, 'result': result}))
+                except OSError:
+                    pass
+            return result
+        
+        return wrapper
+    
+    return decorator
+
+@_disk_cached(_adc_fingerprint)
 def get_billing_accounts():
-    """Get available billing accounts from gcloud"""
+    """Get available billing accounts from the Cloud Billing API (None if they couldn't be listed)"""
+    # Called in-process with application default credentials instead of starting gcloud,
+    # whose Python start-up alone takes longer than the API call
+    import google.auth
+    import google.auth.exceptions
+    import requests
+    from google.auth.transport.requests import AuthorizedSession
+    
     try:
-        result = subprocess.run(
-            ["gcloud", "billing", "accounts", "list", "--format=value(name,displayName)"],
-            capture_output=True, text=True, check=True
-        )
+        credentials, _ = google.auth.default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
         accounts = []
-        for line in result.stdout.strip().split('\n'):
-            if line:
-                parts = line.split('\t')
-                if len(parts) >= 2:
-                    account_id = parts[0].split('/')[-1]  # Extract ID from full path
-                    display_name = parts[1]
-                    accounts.append((account_id, display_name))
-        return accounts
-    except subprocess.CalledProcessError:
-        print("Warning: Could not fetch billing accounts. Make sure you're authenticated with gcloud.")
-        return []
+        params = {'fields': 'billingAccounts(name,displayName),nextPageToken'}
+        with AuthorizedSession(credentials) as session:
+            while True:
+                response = session.get(BILLING_ACCOUNTS_URL, params=params, timeout=30)
+                response.raise_for_status()
+                page = response.json()
+                accounts.extend(
+                    (account['name'].split('/')[-1], account.get('displayName', ''))  # Extract ID from full path
+                    for account in page.get('billingAccounts', [])
+                )
+                if not page.get('nextPageToken'):
+                    return accounts
+                params['pageToken'] = page['nextPageToken']
+    except (google.auth.exceptions.GoogleAuthError, requests.RequestException, ValueError):
+        return None
 
+@_disk_cached(_gh_fingerprint)
 def get_github_username():
-    """Get GitHub username from gh CLI"""
+    """Get GitHub username from gh CLI (None if gh couldn't look it up)"""
+    import subprocess
+    
     try:
         result = subprocess.run(
             ["gh", "api", "user", "--jq", ".login"],
@@ -39,11 +157,19 @@ def get_github_username():
         )
         return result.stdout.strip()
     except subprocess.CalledProcessError:
-        print("Warning: Could not fetch GitHub username. Make sure you're authenticated with gh CLI.")
-        return ""
+        return None
 
 def interactive_setup():
     """Interactive setup of master configuration"""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    # Both lookups wait on the network, so run them concurrently in the
+    # background; warnings are printed here rather than in the probes so output stays in order
+    executor = ThreadPoolExecutor(max_workers=2)
+    billing_probe = executor.submit(get_billing_accounts)
+    github_probe = executor.submit(get_github_username)
+    executor.shutdown(wait=False)
+    
     print("🚀 Master Configuration Setup")
     print("=" * 50)
     print("This will help you create your master_config.yaml file.")
@@ -53,7 +179,11 @@ def interactive_setup():
     
     # Billing Account
     print("📋 BILLING ACCOUNT SETUP")
-    billing_accounts = get_billing_accounts()
+    if not billing_probe.done():
+        print("Looking up billing accounts and GitHub username...")
+    billing_accounts = billing_probe.result()
+    if billing_accounts is None:
+        print("Warning: Could not fetch billing accounts. Make sure you've run 'gcloud auth application-default login'.")
     if billing_accounts:
         print("Available billing accounts:")
         for i, (account_id, display_name) in enumerate(billing_accounts, 1):
@@ -75,9 +205,11 @@ def interactive_setup():
     
     # GitHub Username
     print("\n🐙 GITHUB SETUP")
-    github_username = get_github_username()
+    github_username = github_probe.result()
+    if github_username is None:
+        print("Warning: Could not fetch GitHub username. Make sure you're authenticated with gh CLI.")
     if github_username:
-        use_detected = input(f"Use detected GitHub username '{github_username}'? (y/n): ").lower().startswith('y')
+        use_detected = _yes(f"Use detected GitHub username '{github_username}'? (y/n): ")
         if use_detected:
             config['github_owner'] = github_username
         else:
@@ -87,9 +219,10 @@ def interactive_setup():
     
     # Source Project Settings
     print("\n🏗️  SOURCE PROJECT SETUP")
-    config['source_project'] = input("Enter your source project ID (default: assembled-wh): ") or "assembled-wh"
-    config['source_dataset'] = input("Enter your source dataset (default: warehouse): ") or "warehouse"
-    config['target_dataset'] = input("Enter target dataset for contractors (default: warehouse): ") or "warehouse"
+    defaults = DEFAULT_ANSWERS
+    config['source_project'] = input(f"Enter your source project ID (default: {defaults['source_project']}): ") or defaults['source_project']
+    config['source_dataset'] = input(f"Enter your source dataset (default: {defaults['source_dataset']}): ") or defaults['source_dataset']
+    config['target_dataset'] = input(f"Enter target dataset for contractors (default: {defaults['target_dataset']}): ") or defaults['target_dataset']
     
     # Default Tables
     print("\n📊 DEFAULT TABLES")
@@ -97,9 +230,9 @@ def interactive_setup():
     print("Press Enter on an empty line when done.")
     
     tables = []
-    default_tables = ["ifms", "ifms_consolidated", "ifms_wa", "ifms_consolidated_ttm_avg_data"]
+    default_tables = defaults['default_tables']
     
-    use_defaults = input(f"Use default tables {default_tables}? (y/n): ").lower().startswith('y')
+    use_defaults = _yes(f"Use default tables {default_tables}? (y/n): ")
     if use_defaults:
         tables = default_tables
     else:
@@ -114,8 +247,8 @@ def interactive_setup():
     
     # Project Naming
     print("\n🏷️  PROJECT NAMING")
-    config['project_id_prefix'] = input("Project ID prefix (default: contractor): ") or "contractor"
-    config['project_id_suffix'] = input("Project ID suffix (default: dev-2024): ") or "dev-2024"
+    config['project_id_prefix'] = input(f"Project ID prefix (default: {defaults['project_id_prefix']}): ") or defaults['project_id_prefix']
+    config['project_id_suffix'] = input(f"Project ID suffix (default: {defaults['project_id_suffix']}): ") or defaults['project_id_suffix']
     
     # Contact Info
     print("\n📧 CONTACT INFORMATION")
@@ -124,7 +257,33 @@ def interactive_setup():
         'slack': input("Your Slack handle (optional): ") or ""
     }
     
-    # Build full configuration
+    return build_master_config(config)
+
+def answers_setup(answers_path):
+    """Build the master configuration from an answers file (YAML or JSON) without prompting"""
+    import yaml
+    
+    with open(answers_path, 'r') as f:
+        answers = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader)) or {}
+    if not isinstance(answers, dict):
+        raise ValueError("expected a mapping of setting names to values")
+    
+    config = {**DEFAULT_ANSWERS, **{key: value for key, value in answers.items() if value}}
+    config['contact_info'] = {**DEFAULT_ANSWERS['contact_info'], **config['contact_info']}
+    
+    # Fall back to what the CLIs can detect, as the prompts would offer
+    if not config.get('github_owner'):
+        config['github_owner'] = get_github_username() or ""
+    if not config.get('billing_account_id'):
+        billing_accounts = get_billing_accounts() or []
+        if len(billing_accounts) != 1:
+            raise ValueError(f"billing_account_id is not set and {len(billing_accounts)} billing accounts were found")
+        config['billing_account_id'] = billing_accounts[0][0]
+    
+    return build_master_config(config)
+
+def build_master_config(config):
+    """Combine the collected answers with the fixed settings into the full master configuration"""
     full_config = {
         'billing_account_id': config['billing_account_id'],
         'github_owner': config['github_owner'],
@@ -134,47 +293,46 @@ def interactive_setup():
         'default_tables': config['default_tables'],
         'project_id_prefix': config['project_id_prefix'],
         'project_id_suffix': config['project_id_suffix'],
-        'project_name_template': "Contractor {contractor_name} Development Environment",
-        'contractor_roles': [
-            "roles/bigquery.admin",
-            "roles/run.admin",
-            "roles/secretmanager.admin",
-            "roles/storage.admin",
-            "roles/cloudbuild.builds.editor"
-        ],
-        'github_repo_settings': {
-            'private': True,
-            'default_branch': "main"
-        },
+        'project_name_template': PROJECT_NAME_TEMPLATE,
+        'contractor_roles': CONTRACTOR_ROLES,
+        'github_repo_settings': GITHUB_REPO_SETTINGS,
         'contractor_types': {
             'standard': {
                 'tables': config['default_tables'],
-                'roles': [
-                    "roles/bigquery.admin",
-                    "roles/run.admin"
-                ]
+                'roles': STANDARD_CONTRACTOR_ROLES
             }
         },
         'contact_info': config['contact_info'],
-        'notifications': {
-            'slack_webhook': "",
-            'email_notifications': True
-        }
+        'notifications': NOTIFICATION_SETTINGS
     }
     
     return full_config
 
 def main():
     """Main entry point"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Set up the master configuration file")
+    parser.add_argument("--answers-file", help="YAML or JSON file with the setup answers; skips all prompts")
+    existing = parser.add_mutually_exclusive_group()
+    existing.add_argument("--yes", action="store_true", help="Keep an existing configuration without asking")
+    existing.add_argument("--reconfigure", action="store_true", help="Overwrite an existing configuration without asking")
+    args = parser.parse_args()
+    
     config_path = 'config/master_config.yaml'
     
     if os.path.exists(config_path):
         print(f"✅ Master configuration already exists at {config_path}")
         
         # Show current config summary
+        import yaml
+        
+        # Read the file once: parsed for the summary, shown as-is if the user asks to view it
+        raw_config = None
         try:
             with open(config_path, 'r') as f:
-                existing_config = yaml.safe_load(f)
+                raw_config = f.read()
+            existing_config = yaml.load(raw_config, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
             
             print("\nCurrent configuration summary:")
             print(f"  • Billing Account: {existing_config.get('billing_account_id', 'Not set')}")
@@ -185,14 +343,20 @@ def main():
         except Exception as e:
             print(f"  (Could not read existing config: {e})")
         
-        print("\nWhat would you like to do?")
-        print("1. Keep existing configuration (recommended)")
-        print("2. View full configuration file")
-        print("3. Reconfigure from scratch (overwrites existing)")
-        print("4. Exit")
+        # --yes / --reconfigure answer the menu up front
+        preset_choice = "1" if args.yes else "3" if args.reconfigure else None
+        if preset_choice is None and args.answers_file:
+            sys.exit("❌ Pass --reconfigure to overwrite the existing configuration or --yes to keep it")
+        
+        if preset_choice is None:
+            print("\nWhat would you like to do?")
+            print("1. Keep existing configuration (recommended)")
+            print("2. View full configuration file")
+            print("3. Reconfigure from scratch (overwrites existing)")
+            print("4. Exit")
         
         while True:
-            choice = input("\nEnter your choice (1-4): ").strip()
+            choice = preset_choice or input("\nEnter your choice (1-4): ").strip()
             
             if choice == "1":
                 print("✅ Keeping existing configuration. You're ready to create contractor environments!")
@@ -204,17 +368,17 @@ def main():
             elif choice == "2":
                 print(f"\n📄 Contents of {config_path}:")
                 print("-" * 50)
-                try:
-                    with open(config_path, 'r') as f:
-                        print(f.read())
-                except Exception as e:
-                    print(f"Error reading file: {e}")
+                if raw_config is not None:
+                    print(raw_config)
+                else:
+                    print("Error reading file (see above)")
                 print("-" * 50)
                 continue  # Go back to menu
             
             elif choice == "3":
-                confirm = input("Are you sure you want to overwrite the existing configuration? (y/n): ")
-                if confirm.lower().startswith('y'):
+                if args.reconfigure:
+                    break  # Already confirmed on the command line
+                if _yes("Are you sure you want to overwrite the existing configuration? (y/n): "):
                     break  # Continue with setup
                 else:
                     print("Setup cancelled.")
@@ -230,11 +394,19 @@ def main():
     # Ensure config directory exists
     os.makedirs('config', exist_ok=True)
     
-    config = interactive_setup()
+    if args.answers_file:
+        try:
+            config = answers_setup(args.answers_file)
+        except Exception as e:
+            sys.exit(f"❌ Could not use answers file {args.answers_file}: {e}")
+    else:
+        config = interactive_setup()
     
     # Write configuration file
+    import yaml
+    
     with open(config_path, 'w') as f:
-        yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+        yaml.dump(config, f, Dumper=getattr(yaml, 'CSafeDumper', yaml.SafeDumper), default_flow_style=False, sort_keys=False)
     
     print(f"\n✅ Master configuration saved to {config_path}")
     print("\nNext steps:")
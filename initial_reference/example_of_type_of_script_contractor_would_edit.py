@@ -834,7 +834,11 @@ if __name__ == "__main__":
     if RUN_MODE.lower() == "server":
         # For Cloud Run or local server testing
         port = int(os.environ.get("PORT", 8080))
-        app.run(host='0.0.0.0', port=port)
+        # Bind before serving so readiness can be announced (test_deployment.py waits for READY)
+        from werkzeug.serving import make_server
+        server = make_server('0.0.0.0', port, app, threaded=True)
+        print("READY", flush=True)
+        server.serve_forever()
     else:
         # Direct execution for local testing
         process_risk_ratings()